@@ -0,0 +1,84 @@
+"""
+Runs the benchmark suite without asv, printing the wall time, peak memory and number of eigenvalue problems solved
+by each benchmark. The wall time is the best of several runs; the peak memory and the eigenvalue problems
+are measured on one further run, since tracing memory allocations slows the benchmark down.
+Run from the root of the repository: python -m benchmarks [pattern] [--repeat N]
+"""
+import argparse
+import gc
+import inspect
+import itertools
+import time
+import tracemalloc
+
+from src import ahpy
+
+from . import suite
+
+
+def get_benchmarks(pattern):
+    """
+    Returns the name, class, method name and parameter combinations of every benchmark matching the pattern.
+    :param pattern: string, a substring of the names of the benchmarks to run, such as 'Hierarchy' or 'time_report'
+    """
+    benchmarks = []
+    for class_name, cls in inspect.getmembers(suite, inspect.isclass):
+        if cls.__module__ != suite.__name__:
+            continue
+        params = getattr(cls, 'params', [])
+        if params and not isinstance(params[0], list):
+            params = [params]
+        for method_name in sorted(name for name in dir(cls) if name.startswith('time_')):
+            name = f'{class_name}.{method_name}'
+            if pattern in name:
+                benchmarks.append((name, cls, method_name, list(itertools.product(*params))))
+    return benchmarks
+
+
+def measure(cls, method_name, args, repeat):
+    """
+    Returns the best wall time in seconds, the peak memory in megabytes and the number of eigenvalue problems solved
+    by one benchmark, or None if the benchmark does not support the input parameters.
+    """
+    benchmark = cls()
+    seconds = float('inf')
+    for _ in range(repeat):
+        try:
+            if hasattr(benchmark, 'setup'):
+                benchmark.setup(*args)
+        except NotImplementedError:
+            return None
+        start = time.perf_counter()
+        getattr(benchmark, method_name)(*args)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    if hasattr(benchmark, 'setup'):
+        benchmark.setup(*args)
+    gc.collect()
+    tracemalloc.start()
+    with ahpy.instrument() as records:
+        getattr(benchmark, method_name)(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2 ** 20, records.totals.get('eigen_solves', 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs the AHPy benchmark suite.')
+    parser.add_argument('pattern', nargs='?', default='', help='run only the benchmarks whose names contain this')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of timed runs of each benchmark')
+    arguments = parser.parse_args()
+
+    print(f"{'benchmark':<40}{'parameters':<24}{'seconds':>10}{'peak (MB)':>11}{'eigen solves':>14}")
+    for name, cls, method_name, combinations in get_benchmarks(arguments.pattern):
+        for args in combinations:
+            result = measure(cls, method_name, args, arguments.repeat)
+            if result is None:
+                continue
+            seconds, megabytes, solves = result
+            parameters = ', '.join(str(arg) for arg in args)
+            print(f'{name:<40}{parameters:<24}{seconds:>10.4f}{megabytes:>11.2f}{solves:>14}')
+
+
+if __name__ == '__main__':
+    main()
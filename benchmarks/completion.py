@@ -0,0 +1,30 @@
+"""
+Compares the speed and results of the algorithms used to compute missing pairwise comparisons.
+Run from the root of the repository: python -m benchmarks.completion
+"""
+import time
+
+import numpy as np
+
+from src import ahpy
+
+from .generators import incomplete_comparisons
+
+
+def main():
+    print(f"{'size':>5}{'missing':>9}{'completion':>12}{'seconds':>10}{'speedup':>9}{'lambda_max':>14}{'cr':>8}")
+    for size, missing in ((10, 5), (20, 15), (30, 25)):
+        comparisons = incomplete_comparisons(size, missing)
+        baseline = None
+        for completion in ahpy.COMPLETION_METHODS:
+            start = time.perf_counter()
+            compare = ahpy.Compare('Benchmark', comparisons, completion=completion)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            lambda_max = np.max(np.real(np.linalg.eigvals(compare._matrix)))
+            print(f'{size:>5}{missing:>9}{completion:>12}{seconds:>10.4f}{baseline / seconds:>8.1f}x'
+                  f'{lambda_max:>14.6f}{compare.consistency_ratio:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Generates the synthetic comparisons and hierarchies used by the benchmarks.
+"""
+import itertools
+
+import numpy as np
+
+from src import ahpy
+
+
+def complete_comparisons(size, noise=0.3, seed=0):
+    """
+    Returns a dictionary of slightly inconsistent pairwise comparisons of every pair of elements,
+    derived from random weights and clipped to the fundamental scale.
+    :param size: integer, the number of elements
+    :param noise: float, the standard deviation of the logarithm of the error of each comparison; default is 0.3
+    :param seed: integer, the seed of the random number generator; default is 0
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.lognormal(size=size)
+    return {(i, j): float(np.clip(weights[i] / weights[j] * rng.lognormal(0, noise), 1 / 9, 9))
+            for i, j in itertools.combinations(range(size), 2)}
+
+
+def incomplete_comparisons(size, missing, noise=0.3, seed=0):
+    """
+    Returns a dictionary of slightly inconsistent pairwise comparisons with a number of comparisons removed,
+    keeping the comparisons with the first element so that the remaining comparisons stay connected.
+    :param size: integer, the number of elements
+    :param missing: integer, the number of comparisons to remove
+    :param noise: float, the standard deviation of the logarithm of the error of each comparison; default is 0.3
+    :param seed: integer, the seed of the random number generator; default is 0
+    """
+    rng = np.random.default_rng(seed)
+    comparisons = complete_comparisons(size, noise, seed)
+    removable = [pair for pair in comparisons if pair[0] != 0]
+    for number in rng.choice(len(removable), missing, replace=False):
+        del comparisons[removable[number]]
+    return comparisons
+
+
+def normalized_comparisons(size, seed=0):
+    """
+    Returns a dictionary of measured values of a number of alternatives, as used by normalized Compare objects.
+    :param size: integer, the number of alternatives
+    :param seed: integer, the seed of the random number generator; default is 0
+    """
+    rng = np.random.default_rng(seed)
+    return dict(zip([f'alternative_{number}' for number in range(size)], rng.uniform(1, 10, size).tolist()))
+
+
+def wide_hierarchy(criteria, alternatives, compact=False, lazy=False, seed=0):
+    """
+    Returns the root of a two-level hierarchy in which each criterion rates every alternative.
+    :param criteria: integer, the number of criteria, each of which forms a normalized child node
+    :param alternatives: integer, the number of alternatives rated by each criterion
+    :param compact: boolean, whether to create compact Compare objects; default is False
+    :param lazy: boolean, whether to defer computing the weights of the hierarchy; default is False
+    :param seed: integer, the seed of the random number generator; default is 0
+    """
+    children = [ahpy.Compare(f'criterion_{number}', normalized_comparisons(alternatives, seed + number),
+                             compact=compact) for number in range(criteria)]
+    comparisons = {(children[i].name, children[j].name): value
+                   for (i, j), value in complete_comparisons(criteria, seed=seed).items()}
+    root = ahpy.Compare('Goal', comparisons, cr=False, compact=compact)
+    root.add_children(children, lazy)
+    return root
+
+
+def deep_hierarchy(depth, branching, alternatives, lazy=False, seed=0):
+    """
+    Returns the root of a hierarchy in which every node above the bottom level has the same number of children,
+    and every node on the bottom level compares the same alternatives.
+    The hierarchy is built from the bottom up, so that each level is computed once as it is added.
+    :param depth: integer, the number of levels of criteria above the alternatives
+    :param branching: integer, the number of children of each node above the bottom level
+    :param alternatives: integer, the number of alternatives compared by each node on the bottom level
+    :param lazy: boolean, whether to defer computing the weights of the hierarchy; default is False
+    :param seed: integer, the seed of the random number generator; default is 0
+    """
+    def build(name, level, seed):
+        if level == depth:
+            comparisons = {(f'alternative_{i}', f'alternative_{j}'): value
+                           for (i, j), value in complete_comparisons(alternatives, seed=seed).items()}
+            return ahpy.Compare(name, comparisons, cr=False)
+        children = [build(f'{name}_{number}', level + 1, seed * branching + number + 1)
+                    for number in range(branching)]
+        comparisons = {(children[i].name, children[j].name): value
+                       for (i, j), value in complete_comparisons(branching, seed=seed).items()}
+        node = ahpy.Compare(name, comparisons, cr=False)
+        node.add_children(children, lazy)
+        return node
+
+    return build('node', 1, seed)
+
+
+def array_hierarchy(criteria, alternatives, seed=0):
+    """
+    Returns the root of a two-level hierarchy in which each criterion rates every alternative,
+    using Compare objects backed by numpy arrays that share a single index of the alternatives.
+    :param criteria: integer, the number of criteria, each of which forms a normalized child node
+    :param alternatives: integer, the number of alternatives rated by each criterion
+    :param seed: integer, the seed of the random number generator; default is 0
+    """
+    rng = np.random.default_rng(seed)
+    names = [f'alternative_{number}' for number in range(alternatives)]
+    values = rng.uniform(1, 10, (criteria, alternatives))
+    children = [ahpy.Compare.from_values(f'criterion_{number}', values[number], names, precision=8)
+                for number in range(criteria)]
+    comparisons = {(children[i].name, children[j].name): value
+                   for (i, j), value in complete_comparisons(criteria, seed=seed).items()}
+    root = ahpy.Compare('Goal', comparisons, cr=False, compact=True)
+    root.add_children(children)
+    return root
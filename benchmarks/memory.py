@@ -0,0 +1,39 @@
+"""
+Compares the memory used by a large synthetic hierarchy of Compare objects with and without 'compact=True'.
+Run from the root of the repository: python -m benchmarks.memory
+"""
+import gc
+import time
+import tracemalloc
+
+from .generators import wide_hierarchy
+
+
+def measure(criteria, alternatives, compact):
+    """
+    Returns the time taken to build the hierarchy and the memory it holds once built, in megabytes.
+    The memory is measured on a second build, since tracing memory allocations slows the build down.
+    """
+    start = time.perf_counter()
+    wide_hierarchy(criteria, alternatives, compact)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    root = wide_hierarchy(criteria, alternatives, compact)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del root
+    return seconds, current / 2 ** 20
+
+
+def main():
+    print(f"{'criteria':>9}{'alternatives':>14}{'compact':>9}{'seconds':>10}{'memory (MB)':>13}")
+    for criteria, alternatives in ((100, 100), (200, 1000), (50, 10000)):
+        for compact in (False, True):
+            seconds, megabytes = measure(criteria, alternatives, compact)
+            print(f'{criteria:>9}{alternatives:>14}{str(compact):>9}{seconds:>10.3f}{megabytes:>13.2f}')
+
+
+if __name__ == '__main__':
+    main()
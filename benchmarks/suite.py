@@ -0,0 +1,137 @@
+"""
+Benchmarks the construction, completion, synthesis and reporting of Compare objects and hierarchies.
+The classes follow the conventions of airspeed velocity (asv): each 'time_' method is a benchmark, run once
+for every combination of 'params' after calling 'setup' with the same arguments.
+Run from the root of the repository: python -m benchmarks [pattern]
+"""
+from src import ahpy
+
+from .generators import (array_hierarchy, complete_comparisons, deep_hierarchy, incomplete_comparisons,
+                         normalized_comparisons, wide_hierarchy)
+
+
+class CompleteMatrix:
+    """
+    Computes the priority vector and consistency ratio of a complete matrix using each priority vector method.
+    """
+    params = ([3, 10, 30, 100], list(ahpy.PRIORITY_METHODS))
+    param_names = ['size', 'method']
+
+    def setup(self, size, method):
+        self.comparisons = complete_comparisons(size)
+
+    def time_compare(self, size, method):
+        ahpy.Compare('Benchmark', self.comparisons, method=method)
+
+
+class IncompleteMatrix:
+    """
+    Computes the missing comparisons of an incomplete matrix using each completion algorithm.
+    """
+    params = ([5, 10, 20, 30, 40], list(ahpy.COMPLETION_METHODS))
+    param_names = ['size', 'completion']
+
+    def setup(self, size, completion):
+        self.comparisons = incomplete_comparisons(size, size)
+
+    def time_compare(self, size, completion):
+        ahpy.Compare('Benchmark', self.comparisons, completion=completion)
+
+
+class NormalizedNode:
+    """
+    Computes the weights of a Compare object from the measured values of its elements.
+    """
+    params = ([3, 100, 10000], [False, True])
+    param_names = ['size', 'compact']
+
+    def setup(self, size, compact):
+        self.comparisons = normalized_comparisons(size)
+
+    def time_compare(self, size, compact):
+        ahpy.Compare('Benchmark', self.comparisons, compact=compact)
+
+
+class WideHierarchy:
+    """
+    Synthesizes a two-level hierarchy of many normalized criteria, each rating every alternative.
+    """
+    params = ([10, 100], [100, 1000], [False, True])
+    param_names = ['criteria', 'alternatives', 'compact']
+
+    def time_build(self, criteria, alternatives, compact):
+        wide_hierarchy(criteria, alternatives, compact)
+
+
+class ArrayHierarchy:
+    """
+    Synthesizes a two-level hierarchy of criteria backed by numpy arrays, each rating very many alternatives.
+    """
+    params = ([10, 50], [1000, 100000])
+    param_names = ['criteria', 'alternatives']
+
+    def time_build(self, criteria, alternatives):
+        array_hierarchy(criteria, alternatives)
+
+
+class DeepHierarchy:
+    """
+    Synthesizes a hierarchy of many levels, computing the weights as each level is added or once at the end.
+    """
+    params = ([4, 7], [2, 4], [False, True])
+    param_names = ['depth', 'branching', 'lazy']
+
+    def setup(self, depth, branching, lazy):
+        if depth * branching > 16:
+            raise NotImplementedError
+
+    def time_build(self, depth, branching, lazy):
+        deep_hierarchy(depth, branching, 5, lazy).target_weights
+
+
+class UpdateHierarchy:
+    """
+    Changes a judgment at the bottom of a deep hierarchy and recomputes the weights of the hierarchy.
+    """
+    params = [False, True]
+    param_names = ['lazy']
+
+    def setup(self, lazy):
+        self.root = deep_hierarchy(6, 2, 5, lazy)
+        self.leaf = self.root
+        while self.leaf._node_children:
+            self.leaf = self.leaf._node_children[0]
+
+    def time_update_comparison(self, lazy):
+        self.leaf.update_comparison(('alternative_0', 'alternative_1'), 2)
+        self.root.target_weights
+
+
+class Report:
+    """
+    Builds the complete report of a whole hierarchy.
+    """
+    params = [False, True]
+    param_names = ['verbose']
+
+    def setup(self, verbose):
+        self.root = deep_hierarchy(5, 3, 10)
+
+    def time_report(self, verbose):
+        self.root.report(complete=True, verbose=verbose)
+
+
+class Columns:
+    """
+    Collects the results of many hierarchies into columns of numpy arrays.
+    """
+    params = [10, 100]
+    param_names = ['hierarchies']
+
+    def setup(self, hierarchies):
+        self.roots = [deep_hierarchy(3, 3, 5, seed=seed) for seed in range(hierarchies)]
+
+    def time_extend(self, hierarchies):
+        columns = ahpy.ReportColumns()
+        columns.extend(self.roots)
+        columns.elements
@@ -1,2 +1,3 @@
 from ._version import __version__
 from .ahpy import *
+from . import sensitivity
@@ -1,11 +1,870 @@
+import asyncio
 import bisect
-import copy
+import collections
+import collections.abc
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import importlib
 import itertools
 import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
 import warnings
+import weakref
 
 import numpy as np
+import scipy.linalg as spl
 import scipy.optimize as spo
+import scipy.sparse.csgraph as spc
+
+# Random index estimates from Donegan, H.A. and Dodd, F.J., 'A Note on Saaty's Random Indexes,'
+# Mathematical and Computer Modelling, 15:10, 1991, pp. 135-137 (DOI: 10.1016/0895-7177(91)90098-R) and
+# Saaty's Theory And Applications Of The Analytic Network Process, Pittsburgh: RWS Publications, 2005, p. 31
+RANDOM_INDICES = {
+    'saaty': {3: 0.52, 4: 0.89, 5: 1.11, 6: 1.25, 7: 1.35, 8: 1.40, 9: 1.45,
+              10: 1.49, 11: 1.52, 12: 1.54, 13: 1.56, 14: 1.58, 15: 1.59},
+    'dd': {3: 0.4914, 4: 0.8286, 5: 1.0591, 6: 1.1797, 7: 1.2519,
+           8: 1.3171, 9: 1.3733, 10: 1.4055, 11: 1.4213, 12: 1.4497,
+           13: 1.4643, 14: 1.4822, 15: 1.4969, 16: 1.5078, 17: 1.5153,
+           18: 1.5262, 19: 1.5313, 20: 1.5371, 25: 1.5619, 30: 1.5772,
+           40: 1.5976, 50: 1.6102, 60: 1.6178, 70: 1.6237, 80: 1.6277,
+           90: 1.6213, 100: 1.6339}
+}
+
+
+# The values of the fundamental scale, from which the entries of random reciprocal matrices are drawn
+SAATY_SCALE = (1 / 9, 1 / 8, 1 / 7, 1 / 6, 1 / 5, 1 / 4, 1 / 3, 1 / 2, 1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+
+class Instrumentation:
+    """
+    This class records where the time spent building and updating Compare objects goes. For each Compare object,
+    identified by name, it records the time spent in and the number of calls to each stage of the computation,
+    as well as the number of completion sweeps, objective function evaluations and eigenvalue problems solved.
+    Use 'instrument()' to create one and activate it. Events are attributed to the Compare object being measured
+    by the same thread, so Compare objects created concurrently in threads are recorded separately.
+    :param callback: function, called with the name of each event, the name of the Compare object
+        in which it happened (or None) and its value, in seconds for timed events and as a count for counted events;
+        default is None
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.nodes = {}
+        self.totals = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_stack(self):
+        """
+        Returns the stack of Compare objects being measured by the current thread.
+        """
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def measure(self, node, event):
+        """
+        Times the code run within the context and records it as an event of the input Compare object.
+        Events counted within the context are attributed to the same Compare object.
+        :param node: Compare object, the object in which the event happens
+        :param event: string, the name of the event, such as 'completion'
+        """
+        stack = self._get_stack()
+        stack.append(node)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            self._record(node.name, f'{event}_seconds', seconds)
+            self._record(node.name, f'{event}_calls', 1)
+            if self.callback is not None:
+                self.callback(event, node.name, seconds)
+
+    def count(self, event, value=1):
+        """
+        Adds to the count of an event of the Compare object currently being measured.
+        :param event: string, the name of the event, such as 'eigen_solves'
+        :param value: integer, the amount to add; default is 1
+        """
+        stack = self._get_stack()
+        name = stack[-1].name if stack else None
+        self._record(name, event, value)
+        if self.callback is not None:
+            self.callback(event, name, value)
+
+    def _record(self, name, key, value):
+        """
+        Adds the input value to the totals and, unless the event happened outside of any Compare object,
+        to the records of the named Compare object.
+        """
+        with self._lock:
+            records = [self.totals] if name is None else [self.totals, self.nodes.setdefault(name, {})]
+            for record in records:
+                record[key] = record.get(key, 0) + value
+
+    def to_dict(self):
+        """
+        Returns the records of every Compare object and their totals as a dictionary.
+        """
+        return {'nodes': {name: dict(record) for name, record in self.nodes.items()}, 'totals': dict(self.totals)}
+
+    def to_json(self, **kwargs):
+        """
+        Returns the records of every Compare object and their totals as a JSON string.
+        :param kwargs: the keyword arguments passed to 'json.dumps()', such as 'indent'
+        """
+        return json.dumps(self.to_dict(), default=str, **kwargs)
+
+
+# The active Instrumentation object, if any; see 'instrument()'
+_instrumentation = None
+
+
+@contextlib.contextmanager
+def instrument(callback=None):
+    """
+    Records the time spent in each stage of building and updating Compare objects within the context,
+    yielding the Instrumentation object that holds the records. Instrumentation is process-wide and is not
+    recorded by the worker processes used by 'Compose.add_comparisons(workers=N)'.
+    Example: with ahpy.instrument() as records: ...; print(records.to_json(indent=2))
+    :param callback: function, called with the name, Compare object name and value of each event
+        as it is recorded; see the 'Instrumentation' class; default is None
+    """
+    global _instrumentation
+    previous = _instrumentation
+    _instrumentation = Instrumentation(callback)
+    try:
+        yield _instrumentation
+    finally:
+        _instrumentation = previous
+
+
+def _instrumented(event):
+    """
+    Returns a decorator that records each call to a method of a Compare object as the input event
+    while instrumentation is active; see 'instrument()'.
+    :param event: string, the name of the event
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if _instrumentation is None:
+                return method(self, *args, **kwargs)
+            with _instrumentation.measure(self, event):
+                return method(self, *args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _count(event, value=1):
+    """
+    Adds to the count of an event while instrumentation is active; see 'instrument()'.
+    :param event: string, the name of the event
+    :param value: integer, the amount to add; default is 1
+    """
+    if _instrumentation is not None:
+        _instrumentation.count(event, value)
+
+
+def _eigvals(matrices):
+    """
+    Returns the eigenvalues of a matrix or a stack of matrices, counting the eigenvalue problems solved.
+    :param matrices: numpy array, a matrix of shape (k, k) or a stack of matrices of shape (n, k, k)
+    """
+    _count('eigen_solves', int(np.prod(np.shape(matrices)[:-2])))
+    return np.linalg.eigvals(matrices)
+
+
+# The smallest matrices whose largest eigenvalue is found by power iteration during cyclic completion;
+# smaller matrices are solved as fast or faster by a full eigenvalue decomposition (see the 'IncompleteMatrix'
+# benchmark: at 20 x 20 both take the same time, at 30 x 30 power iteration takes half the time)
+_PERRON_ITERATION_SIZE = 30
+
+
+def _perron_root(matrix, vector, tolerance=1e-13, iterations=100):
+    """
+    Returns the largest eigenvalue of a positive matrix, found by power iteration starting from an estimate of its
+    principal eigenvector, and overwrites the estimate with the principal eigenvector.
+    Each iteration bounds the eigenvalue between the smallest and the largest ratio of the elements of the product
+    of the matrix and the vector to those of the vector (the Collatz-Wielandt bounds), so the iteration stops
+    once the bounds agree within the relative tolerance. After a small change to the matrix, the previous
+    principal eigenvector is a close estimate and only a few iterations, each O(n^2), are needed.
+    If the bounds do not agree after the given number of iterations, the eigenvalues are computed directly.
+    :param matrix: numpy array, a positive matrix of shape (k, k)
+    :param vector: numpy array, a positive estimate of the principal eigenvector, of shape (k,)
+    :param tolerance: float, the largest relative difference between the bounds of the eigenvalue; default is 1e-13
+    :param iterations: integer, the number of iterations before the eigenvalues are computed directly;
+        default is 100
+    """
+    for iteration in range(1, iterations + 1):
+        product = matrix @ vector
+        ratios = product / vector
+        low, high = ratios.min(), ratios.max()
+        vector[:] = product / high
+        if high - low <= tolerance * high:
+            _count('power_iterations', iteration)
+            return (low + high) / 2
+    _count('power_iterations', iterations)
+    return np.max(np.real(_eigvals(matrix)))
+
+
+def _interpolate_random_indices(ri_dict):
+    """
+    Returns a dictionary of random index estimates for every matrix size from the smallest to the largest
+    published size, computing a weighted estimate for each size that falls between two published estimates.
+    :param ri_dict: dictionary, each key is a matrix size and each value is its published random index estimate
+    """
+    s = tuple(ri_dict.keys())
+    random_indices = {}
+    for size in range(s[0], s[-1] + 1):
+        try:
+            random_indices[size] = ri_dict[size]
+        except KeyError:
+            smaller = s[bisect.bisect_left(s, size) - 1]
+            larger = s[bisect.bisect_right(s, size)]
+            estimate = (ri_dict[larger] - ri_dict[smaller]) / (larger - smaller)
+            random_indices[size] = estimate * (size - smaller) + ri_dict[smaller]
+    return random_indices
+
+
+# Computed once and shared by all Compare objects
+_random_index_tables = {name: _interpolate_random_indices(ri_dict) for name, ri_dict in RANDOM_INDICES.items()}
+
+# Monte Carlo estimates for sizes beyond the 'dd' table, keyed by size, loaded from and saved to the cache file
+_estimated_random_indices = None
+_random_index_cache = os.path.join(os.path.expanduser('~'), '.cache', 'ahpy', 'random_indices.json')
+
+# The Monte Carlo estimate of the largest size of the 'dd' table, 'estimate_random_index(100)', against which
+# the estimates of larger sizes are scaled; it is fixed, so that only the size of a matrix is ever estimated
+_LARGEST_RANDOM_INDEX_ESTIMATE = 1.7311600575215889
+
+
+def _check_random_index_size(size, random_index):
+    """
+    Raises a ValueError if the chosen random index does not support a matrix of the given size.
+    :param size: integer, the number of rows of the matrix
+    :param random_index: string, the random index estimates used to compute the consistency ratio
+    """
+    if random_index == 'saaty' and size > 15:
+        msg = f"The input matrix of {size} x {size} is too large for {random_index}" \
+              " and a consistency ratio cannot be computed.\n" \
+              "\tThe maximum matrix size supported by the 'saaty' random index is 15 x 15;\n" \
+              "\tthe 'dd' random index supports matrices of any size.\n" \
+              "\tTo compute the priority vector of the matrix without a consistency ratio\n," \
+              "\tuse the 'cr=False' argument."
+        raise ValueError(msg)
+
+
+def _sum_lambda_max(size, samples, seed_sequence):
+    """
+    Returns the sum of the principal eigenvalues of a number of random reciprocal matrices,
+    whose entries are drawn uniformly from the fundamental scale.
+    :param size: integer, the number of rows of each matrix
+    :param samples: integer, the number of matrices
+    :param seed_sequence: numpy SeedSequence, the seed of the random number generator
+    """
+    rng = np.random.default_rng(seed_sequence)
+    rows, columns = np.triu_indices(size, 1)
+    values = rng.choice(SAATY_SCALE, (samples, len(rows)))
+    matrices = np.ones((samples, size, size))
+    matrices[:, rows, columns] = values
+    matrices[:, columns, rows] = np.reciprocal(values)
+    return np.sum(np.max(np.real(_eigvals(matrices)), axis=1))
+
+
+def estimate_random_index(size, samples=1000, seed=0, workers=None):
+    """
+    Returns a Monte Carlo estimate of the random index of a matrix of the given size: the mean consistency index
+    of random reciprocal matrices whose entries are drawn uniformly from the fundamental scale.
+    The matrices are generated and their eigenvalues computed in vectorized chunks; each chunk has its own seed,
+    derived from the input seed, so the estimate does not depend on the number of workers.
+    :param size: integer, the number of rows of the matrix; must be greater than 2
+    :param samples: integer, the number of random matrices; default is 1000
+    :param seed: integer, the seed of the random number generator; default is 0
+    :param workers: integer, the number of processes across which to spread the chunks;
+        if None, the chunks are computed in the current process; default is None
+    """
+    if size < 3:
+        msg = f'The random index of a matrix of {size} x {size} is undefined. The size must be greater than 2.'
+        raise ValueError(msg)
+    # Each chunk holds at most about 4 million matrix entries
+    chunk_size = max(1, min(samples, 2 ** 22 // size ** 2))
+    counts = [chunk_size] * (samples // chunk_size) + ([samples % chunk_size] if samples % chunk_size else [])
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(counts))
+    if workers is None:
+        total = sum(map(_sum_lambda_max, [size] * len(counts), counts, seed_sequences))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            total = sum(executor.map(_sum_lambda_max, [size] * len(counts), counts, seed_sequences))
+    return (total / samples - size) / (size - 1)
+
+
+def set_random_index_cache(path):
+    """
+    Sets the file in which Monte Carlo random index estimates are saved, so that each estimate is only computed once
+    across all processes using the same file. The estimates already computed by the current process are kept.
+    :param path: string, the path of the JSON file; if None, the estimates are only kept in memory
+    """
+    global _random_index_cache
+    _random_index_cache = path
+    if _estimated_random_indices is not None:
+        _estimated_random_indices.update(_read_random_index_cache())
+        _save_estimated_random_indices()
+
+
+def _atomic_write(path, data):
+    """
+    Writes text or bytes to a file, creating its directory if needed. The data is first written to a temporary file
+    in the same directory, which then replaces the file, so other processes never read a partially written file;
+    the temporary file is removed if anything fails.
+    :param path: string, the path of the file
+    :param data: string or bytes, the contents of the file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    file = tempfile.NamedTemporaryFile('wb' if isinstance(data, bytes) else 'w', dir=directory, delete=False)
+    try:
+        with file:
+            file.write(data)
+        os.replace(file.name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(file.name)
+        raise
+
+
+def _read_random_index_cache():
+    """
+    Returns the dictionary of Monte Carlo random index estimates saved in the cache file,
+    or an empty dictionary if there is no cache file or it cannot be read.
+    """
+    try:
+        with open(_random_index_cache) as file:
+            return {int(size): value for size, value in json.load(file).items()}
+    except (TypeError, OSError, ValueError):
+        return {}
+
+
+def _load_estimated_random_indices():
+    """
+    Returns the dictionary of Monte Carlo random index estimates, loading it from the cache file on first use.
+    """
+    global _estimated_random_indices
+    if _estimated_random_indices is None:
+        _estimated_random_indices = _read_random_index_cache()
+    return _estimated_random_indices
+
+
+def _save_estimated_random_indices():
+    """
+    Saves the dictionary of Monte Carlo random index estimates to the cache file, if there is one,
+    merging it with any estimates saved by other processes.
+    """
+    if _random_index_cache is None:
+        return
+    estimates = {**_estimated_random_indices, **_read_random_index_cache()}
+    try:
+        _atomic_write(_random_index_cache, json.dumps({str(size): value for size, value in sorted(estimates.items())}))
+    except OSError:
+        warnings.warn(f'Random index estimates could not be saved to {_random_index_cache}.')
+
+
+def _get_estimated_random_index(size):
+    """
+    Returns the Monte Carlo random index estimate of a matrix of the given size, computing and caching it if needed.
+    :param size: integer, the number of rows of the matrix
+    """
+    estimates = _load_estimated_random_indices()
+    if size not in estimates:
+        warnings.warn(f'Estimating the random index of a {size} x {size} matrix, which may take some time. '
+                      'Use precompute_random_indices() to compute estimates ahead of time.')
+        estimates[size] = estimate_random_index(size)
+        _save_estimated_random_indices()
+    return estimates[size]
+
+
+def precompute_random_indices(sizes, workers=None):
+    """
+    Computes and caches the Monte Carlo random index estimates used for matrices larger than those supported by
+    the published 'dd' estimates, so that no Compare object has to wait for an estimate to be computed.
+    :param sizes: iterable, the matrix sizes for which to compute estimates; sizes already cached are skipped
+    :param workers: integer, the number of processes used to compute each estimate; default is None
+    """
+    estimates = _load_estimated_random_indices()
+    largest = max(RANDOM_INDICES['dd'])
+    for size in sorted(set(sizes)):
+        if size > largest and size not in estimates:
+            estimates[size] = estimate_random_index(size, workers=workers)
+            _save_estimated_random_indices()
+
+
+def _get_random_index(size, random_index):
+    """
+    Returns the random index estimate for a matrix of the given size, or None if the random index is not valid.
+    If the size of a matrix exceeds the largest size of the 'dd' estimates, returns a Monte Carlo estimate
+    (see 'estimate_random_index()'), scaled so that it matches the published 'dd' estimate at that largest size.
+    :param size: integer, the number of rows of the matrix
+    :param random_index: string, the random index estimates used to compute the consistency ratio
+    """
+    try:
+        return _random_index_tables[random_index][size]
+    except KeyError:
+        if random_index != 'dd' or size < 3:
+            return None
+    largest = max(RANDOM_INDICES['dd'])
+    return _get_estimated_random_index(size) * RANDOM_INDICES['dd'][largest] / _LARGEST_RANDOM_INDEX_ESTIMATE
+
+
+def _comparison_locations(comparisons, indices):
+    """
+    Returns the row indices, column indices and values of the input comparisons as numpy arrays.
+    If both a comparison and its inverse are present, only the last one to appear is kept.
+    :param comparisons: dictionary, each key is a tuple of two elements and each value is their pairwise comparison
+    :param indices: dictionary, each key is an element and each value is its row index in the matrix
+    """
+    locations = {}
+    for (first, second), value in comparisons.items():
+        i, j = indices[first], indices[second]
+        locations.pop((j, i), None)
+        locations[(i, j)] = float(value)
+    if not locations:
+        return np.empty(0, int), np.empty(0, int), np.empty(0)
+    rows, columns = np.array(tuple(locations), int).T
+    return rows, columns, np.fromiter(locations.values(), float, len(locations))
+
+
+PRIORITY_METHODS = ('squaring', 'power', 'eigen', 'geometric')
+COMPLETION_METHODS = ('cyclic', 'llsm', 'newton')
+
+# The factor by which the bounds of the search for a warm-started missing comparison differ from its current value
+_WARM_START_RATIO = 2
+
+
+def _check_method(method, valid_methods=PRIORITY_METHODS):
+    """
+    Raises a ValueError if the input method is not one of the valid methods.
+    :param method: string, the method to check
+    :param valid_methods: tuple, the valid methods; default is the methods for computing priority vectors
+    """
+    if method not in valid_methods:
+        msg = f"'{method}' is an invalid method. Valid methods are: {', '.join(valid_methods)}."
+        raise ValueError(msg)
+
+
+def _is_consistent(matrix, tolerance=1e-12):
+    """
+    Returns True if a positive reciprocal matrix is consistent, meaning that every comparison is the product
+    of the comparisons of its elements with the first element (a_ij = a_i1 * a_1j), checked on the natural logarithms
+    of the matrix in a single vectorized operation. Every matrix with fewer than three rows is consistent.
+    Given a stack of matrices, returns a boolean numpy array with the result for each matrix.
+    :param matrix: numpy array, a positive reciprocal matrix of shape (k, k) or a stack of them of shape (n, k, k)
+    :param tolerance: float, the largest absolute difference allowed between the logarithms; default is 1e-12
+    """
+    if matrix.shape[-1] < 3:
+        return np.ones(matrix.shape[:-2], bool) if matrix.ndim > 2 else True
+    log_matrix = np.log(matrix)
+    deviations = np.abs(log_matrix - log_matrix[..., :, :1] - log_matrix[..., :1, :])
+    return deviations.max(axis=(-2, -1)) <= tolerance
+
+
+def _consistent_priority_vectors(matrices, precision):
+    """
+    Returns the priority vectors of a stack of consistent matrices, which are exactly the normalized geometric means
+    of their rows, so that no iteration or eigendecomposition is needed.
+    :param matrices: numpy array, the stacked consistent matrices of shape (n, k, k)
+    :param precision: integer, number of decimal places used when rounding the priority vectors
+    """
+    means = np.exp(np.log(matrices).sum(axis=2) / matrices.shape[2])
+    return np.divide(means, means.sum(axis=1, keepdims=True)).round(precision)
+
+
+# Squared matrices whose largest value exceeds this are rescaled, so that squaring them again cannot overflow
+_SQUARING_RESCALE_LIMIT = 2.0 ** 256
+
+
+def _squaring_priority_vectors(matrices, iterations, precision):
+    """
+    Returns the priority vectors of a stack of matrices by normalizing the rows of repeatedly squared matrices.
+    A matrix stops being squared once there is no difference between its last two principal eigenvectors
+    (after rounding to the specified precision), or once the predefined number of iterations has been met.
+    :param matrices: numpy array, the stacked matrices of shape (n, k, k)
+    :param iterations: integer, number of iterations to run before the function stops
+    :param precision: integer, number of decimal places used when comparing and rounding the eigenvectors
+    """
+    priority_vectors = np.empty(matrices.shape[:2])
+    active = np.arange(len(matrices))
+    comp_eigenvectors = np.zeros(matrices.shape[:2])
+
+    for remaining in range(max(iterations, 1), 0, -1):
+        # Compute the principal eigenvectors by normalizing the rows of the newly squared matrices
+        sq_matrices = np.matmul(matrices, matrices)
+        row_sums = np.sum(sq_matrices, axis=2)
+        total_sums = np.sum(sq_matrices.reshape(len(sq_matrices), -1), axis=1)
+        principal_eigenvectors = np.divide(row_sums, total_sums[:, np.newaxis])
+
+        remainders = np.subtract(principal_eigenvectors, comp_eigenvectors).round(precision)
+        converged = ~np.any(remainders, axis=1) if remaining > 1 else np.ones(len(active), bool)
+        priority_vectors[active[converged]] = principal_eigenvectors[converged].round(precision)
+
+        active = active[~converged]
+        if not active.size:
+            break
+        matrices = sq_matrices[~converged]
+        maxima = np.max(matrices, axis=(1, 2))
+        if maxima.max() > _SQUARING_RESCALE_LIMIT:
+            # Rescaling by a power of two is exact, so it prevents overflow without changing the eigenvectors
+            matrices = np.ldexp(matrices, -np.frexp(maxima)[1][:, np.newaxis, np.newaxis])
+        comp_eigenvectors = principal_eigenvectors[~converged]
+
+    return priority_vectors
+
+
+def _squaring_priority_vector(matrix, iterations, precision):
+    """
+    Returns the priority vector of a single matrix by normalizing the rows of the repeatedly squared matrix;
+    see '_squaring_priority_vectors()'. Most matrices are small, so they are squared without the bookkeeping
+    needed to track a stack of matrices.
+    :param matrix: numpy array, the matrix of shape (k, k)
+    :param iterations: integer, number of iterations to run before the function stops
+    :param precision: integer, number of decimal places used when comparing and rounding the eigenvectors
+    """
+    comp_eigenvector = np.zeros(len(matrix))
+    for remaining in range(max(iterations, 1), 0, -1):
+        sq_matrix = np.matmul(matrix, matrix)
+        principal_eigenvector = np.divide(sq_matrix.sum(axis=1), sq_matrix.sum())
+        if remaining == 1 or not np.subtract(principal_eigenvector, comp_eigenvector).round(precision).any():
+            return principal_eigenvector.round(precision)
+        matrix = sq_matrix
+        maximum = matrix.max()
+        if maximum > _SQUARING_RESCALE_LIMIT:
+            matrix = np.ldexp(matrix, -np.frexp(maximum)[1])
+        comp_eigenvector = principal_eigenvector
+
+
+def _power_priority_vectors(matrices, iterations, precision, initial_vectors=None):
+    """
+    Returns the priority vectors and principal eigenvalues of a stack of matrices using power iteration.
+    A matrix stops being iterated once its eigenvector changes by less than a small fraction of the specified
+    precision, or once the predefined number of iterations has been met.
+    :param matrices: numpy array, the stacked matrices of shape (n, k, k)
+    :param iterations: integer, maximum number of iterations to run before the function stops
+    :param precision: integer, number of decimal places used when rounding the eigenvectors
+    :param initial_vectors: numpy array, the eigenvectors of shape (n, k) from which to start the iteration,
+        e.g. the priority vectors of previous, similar matrices; default is None
+    """
+    if initial_vectors is None:
+        vectors = np.full(matrices.shape[:2], 1 / matrices.shape[1])
+    else:
+        vectors = np.divide(initial_vectors, np.sum(initial_vectors, axis=1, keepdims=True))
+    lambda_max = np.full(len(matrices), float(matrices.shape[1]))
+    active = np.arange(len(matrices))
+    tolerance = 0.1 ** (precision + 4)
+
+    for _ in range(max(iterations, 1)):
+        products = np.matmul(matrices[active], vectors[active, :, np.newaxis])[..., 0]
+        # The eigenvectors sum to one, so the sum of each product estimates the principal eigenvalue
+        sums = np.sum(products, axis=1)
+        products = np.divide(products, sums[:, np.newaxis])
+        converged = np.max(np.abs(products - vectors[active]), axis=1) < tolerance
+        vectors[active] = products
+        lambda_max[active] = sums
+        active = active[~converged]
+        if not active.size:
+            break
+
+    return vectors.round(precision), lambda_max
+
+
+def _eigen_priority_vectors(matrices, precision):
+    """
+    Returns the priority vectors and principal eigenvalues of a stack of matrices
+    from a single eigendecomposition of each matrix.
+    :param matrices: numpy array, the stacked matrices of shape (n, k, k)
+    :param precision: integer, number of decimal places used when rounding the eigenvectors
+    """
+    _count('eigen_solves', len(matrices))
+    eigenvalues, eigenvectors = np.linalg.eig(matrices)
+    principal = np.argmax(np.real(eigenvalues), axis=1)
+    lambda_max = np.real(np.take_along_axis(eigenvalues, principal[:, np.newaxis], axis=1)[:, 0])
+    vectors = np.real(np.take_along_axis(eigenvectors, principal[:, np.newaxis, np.newaxis], axis=2)[..., 0])
+    vectors = np.divide(vectors, np.sum(vectors, axis=1, keepdims=True))
+    return vectors.round(precision), lambda_max
+
+
+def _geometric_priority_vectors(matrices, precision):
+    """
+    Returns the priority vectors of a stack of matrices by normalizing the geometric means of their rows.
+    :param matrices: numpy array, the stacked matrices of shape (n, k, k)
+    :param precision: integer, number of decimal places used when rounding the priority vectors
+    """
+    row_means = np.exp(np.mean(np.log(matrices), axis=2))
+    return np.divide(row_means, np.sum(row_means, axis=1, keepdims=True)).round(precision)
+
+
+def _compute_priority_vectors(matrices, method, iterations, precision, initial_vectors=None):
+    """
+    Returns the priority vectors of a stack of matrices, along with their principal eigenvalues if they are known,
+    else None. The priority vectors of consistent matrices, including every matrix with fewer than three rows,
+    are computed directly and their principal eigenvalue is their size, exactly as for a Compare object;
+    the priority vectors of the other matrices are computed using the given method, and if it does not compute
+    their principal eigenvalues, those eigenvalues are NaN.
+    :param matrices: numpy array, the stacked matrices of shape (n, k, k)
+    :param method: string, the method used to compute the priority vectors of inconsistent matrices;
+        valid input: 'squaring', 'power', 'eigen', 'geometric'
+    :param iterations: integer, number of iterations before the 'squaring' and 'power' methods stop
+    :param precision: integer, number of decimal places used when computing the priority vectors
+    :param initial_vectors: numpy array, the eigenvectors from which to start the 'power' method; default is None
+    """
+    consistent = _is_consistent(matrices)
+    if not np.any(consistent):
+        return _compute_method_priority_vectors(matrices, method, iterations, precision, initial_vectors)
+
+    priority_vectors = np.empty(matrices.shape[:2])
+    lambda_max = np.full(len(matrices), float(matrices.shape[2]))
+    priority_vectors[consistent] = _consistent_priority_vectors(matrices[consistent], precision)
+    inconsistent = ~consistent
+    if np.any(inconsistent):
+        priority_vectors[inconsistent], inconsistent_lambda_max = _compute_method_priority_vectors(
+            matrices[inconsistent], method, iterations, precision,
+            initial_vectors[inconsistent] if initial_vectors is not None else None)
+        lambda_max[inconsistent] = inconsistent_lambda_max if inconsistent_lambda_max is not None else np.nan
+    return priority_vectors, lambda_max
+
+
+def _compute_method_priority_vectors(matrices, method, iterations, precision, initial_vectors=None):
+    """
+    Returns the priority vectors of a stack of matrices using the given method, along with their principal
+    eigenvalues if the method computes them, else None.
+    :param matrices: numpy array, the stacked matrices of shape (n, k, k)
+    :param method: string, the method used to compute the priority vectors;
+        valid input: 'squaring', 'power', 'eigen', 'geometric'
+    :param iterations: integer, number of iterations before the 'squaring' and 'power' methods stop
+    :param precision: integer, number of decimal places used when computing the priority vectors
+    :param initial_vectors: numpy array, the eigenvectors from which to start the 'power' method; default is None
+    """
+    if method == 'power':
+        return _power_priority_vectors(matrices, iterations, precision, initial_vectors)
+    elif method == 'eigen':
+        return _eigen_priority_vectors(matrices, precision)
+    elif method == 'geometric':
+        return _geometric_priority_vectors(matrices, precision), None
+    return _squaring_priority_vectors(matrices, iterations, precision), None
+
+
+class _ElementIndex:
+    """
+    This class holds a list of elements and a dictionary mapping each element to its index in that list,
+    so that Compare objects comparing the same elements can share a single copy of both.
+    """
+    __slots__ = ('elements', 'indices', '_digest', '__weakref__')
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.indices = {element: index for index, element in enumerate(elements)}
+        self._digest = None
+
+    def get_digest(self):
+        """
+        Returns a hash of the elements, computed only once since the elements of an index never change.
+        """
+        if self._digest is None:
+            self._digest = hashlib.sha256(repr(self.elements).encode()).hexdigest()
+        return self._digest
+
+    def __reduce__(self):
+        # Unpickled indices, such as those of Compare objects created in other processes, are shared again
+        return _get_element_index, (self.elements,)
+
+
+# Element indices are removed from the registry once no Compare object refers to them
+_element_indices = weakref.WeakValueDictionary()
+
+
+def _get_element_index(elements):
+    """
+    Returns the shared '_ElementIndex' of the input elements, creating it if it does not yet exist.
+    :param elements: list, the elements of a Compare object, in order
+    """
+    key = tuple(elements)
+    element_index = _element_indices.get(key)
+    if element_index is None:
+        element_index = _ElementIndex(elements)
+        _element_indices[key] = element_index
+    return element_index
+
+
+class _ResultCache:
+    """
+    This class holds the computed results of Compare objects in a least recently used cache of limited size,
+    keyed by a hash of their input comparisons and every parameter that affects their results,
+    optionally backed by a directory of pickle files shared across processes and sessions.
+    :param maxsize: integer, the number of results held in memory
+    :param path: string, the directory of the on-disk cache; if None, results are only held in memory
+    """
+
+    def __init__(self, maxsize, path):
+        self.maxsize = maxsize
+        self.path = path
+        self.results = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(compare):
+        """
+        Returns the hash of the input comparisons, warm start and parameters of a Compare object.
+        The comparisons are hashed in insertion order, since that order determines the order of the elements.
+        The comparisons of a Compare object created by 'Compare.from_values()' are hashed as the bytes of its values
+        array and the hash of its shared index of alternatives. By the time the key is computed, a dictionary or
+        Compare object warm start has been replaced by the starting value of each missing comparison.
+        :param compare: Compare object, the object whose results are cached
+        """
+        if isinstance(compare.comparisons, _ValueMapping):
+            values = np.ascontiguousarray(compare.comparisons.values, float)
+            comparisons = (compare.comparisons.element_index.get_digest(), hashlib.sha256(values).hexdigest())
+        else:
+            comparisons = tuple((key, float(value).hex()) for key, value in compare.comparisons.items())
+        if isinstance(compare.warm_start, dict):
+            warm_start = tuple(float(value).hex() for value in compare.warm_start.values())
+        else:
+            warm_start = compare.warm_start.lower() if compare.warm_start is not None else None
+        parameters = (compare.precision, compare.random_index, compare.iterations, compare.tolerance, compare.cr,
+                      compare.method, compare.completion, warm_start)
+        return hashlib.sha256(repr((comparisons, parameters)).encode()).hexdigest()
+
+    def _get_file(self, key):
+        """
+        Returns the path of the on-disk cache file of the input key.
+        """
+        return os.path.join(self.path, f'{key}.pkl')
+
+    def get(self, key):
+        """
+        Returns the cached results of the input key, or None if there are none.
+        :param key: string, the hash of the inputs of a Compare object
+        """
+        with self._lock:
+            results = self.results.get(key)
+            if results is not None:
+                self.results.move_to_end(key)
+        if results is None and self.path is not None:
+            try:
+                with open(self._get_file(key), 'rb') as file:
+                    results = pickle.load(file)
+                self._add(key, results)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+        with self._lock:
+            if results is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return results
+
+    def put(self, key, results):
+        """
+        Caches the results of the input key in memory and, if there is an on-disk cache, on disk.
+        :param key: string, the hash of the inputs of a Compare object
+        :param results: dictionary, the computed results of the Compare object
+        """
+        self._add(key, results)
+        if self.path is None:
+            return
+        try:
+            _atomic_write(self._get_file(key), pickle.dumps(results))
+        except OSError:
+            warnings.warn(f'Results could not be saved to {self.path}.')
+
+    def _add(self, key, results):
+        """
+        Adds the results of the input key to the in-memory cache, evicting the least recently used results if full.
+        """
+        with self._lock:
+            self.results[key] = results
+            self.results.move_to_end(key)
+            while len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+                self.evictions += 1
+
+    def info(self):
+        """
+        Returns the number of cache hits, misses and evictions, along with the current and maximum size of the cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.results),
+                'maxsize': self.maxsize, 'path': self.path}
+
+
+# The active result cache, if any; see 'enable_cache()'
+_result_cache = None
+
+
+def enable_cache(maxsize=1024, path=None):
+    """
+    Caches the computed results of every Compare object created from now on, so that creating a Compare object
+    with the same comparisons and parameters as an earlier one restores its results instead of recomputing them.
+    Replaces any cache that is already enabled.
+    :param maxsize: integer, the number of results held in memory, discarding the least recently used results
+        once full; default is 1024
+    :param path: string, the directory in which results are also saved as pickle files, so that they can be shared
+        across processes and sessions; only use a directory whose contents you trust; if None, results are only held
+        in memory; default is None
+    """
+    global _result_cache
+    _result_cache = _ResultCache(maxsize, path)
+
+
+def disable_cache():
+    """
+    Stops caching the results of Compare objects and clears the in-memory cache. Files in an on-disk cache are kept.
+    """
+    global _result_cache
+    _result_cache = None
+
+
+def cache_info():
+    """
+    Returns the number of hits, misses and evictions of the result cache, along with its current and maximum size
+    and the directory of its on-disk cache, or None if the cache is not enabled.
+    """
+    return _result_cache.info() if _result_cache is not None else None
+
+
+class _ValueMapping(collections.abc.Mapping):
+    """
+    This class presents an array of measured values, and the shared index of the elements they measure,
+    as a read-only dictionary, so that a Compare object created by 'Compare.from_values()' can be used
+    wherever a Compare object created from a dictionary can.
+    :param element_index: _ElementIndex object, the shared index of the elements
+    :param values: numpy array, the measured value of each element, in the order of the index
+    """
+    __slots__ = ('element_index', 'values')
+
+    def __init__(self, element_index, values):
+        self.element_index = element_index
+        self.values = values
+
+    def __getitem__(self, key):
+        return self.values[self.element_index.indices[key]]
+
+    def __iter__(self):
+        return iter(self.element_index.elements)
+
+    def __len__(self):
+        return len(self.element_index.elements)
 
 
 class Compare:
@@ -30,9 +889,36 @@ class Compare:
         '_complete_matrix()'; the algorithm stops when the difference between the norms of two cycles
          of coordinates is less than this value; default is 0.0001
     :param cr: boolean, whether to compute the priority vector's consistency ratio; default is True
+    :param method: string, the method used to compute the priority vector;
+        see '_compute_priority_vector()' for more information regarding the different methods;
+        valid input: 'squaring', 'power', 'eigen', 'geometric'; default is 'squaring'
+    :param completion: string, the algorithm used to compute optimal values for missing comparisons;
+        see '_complete_matrix()' for more information regarding the different algorithms;
+        valid input: 'cyclic', 'llsm', 'newton'; default is 'cyclic'
+    :param compact: boolean, whether to reduce the memory used by the Compare object by storing its weights
+        as a numpy array and building the 'local_weights' and 'global_weights' dictionaries only when accessed,
+        and by sharing its list of elements with other compact Compare objects comparing the same elements;
+        default is False
+    :param warm_start: dictionary, Compare object or string, the initial values of the missing comparisons
+        of the 'cyclic' and 'newton' completion algorithms, given as (i) a dictionary of pairwise comparison values,
+        (ii) a Compare object comparing some or all of the same elements, such as one built from an earlier wave of
+        the same survey, whose values are used for the comparisons it shares, or (iii) 'llsm', the closed-form
+        logarithmic least squares estimate; when given, the 'cyclic' algorithm also searches for each missing
+        comparison near its current value; if None, every missing comparison starts at 1; default is None
     """
+    __slots__ = ('name', 'comparisons', 'precision', 'random_index', 'iterations', 'tolerance', 'cr', 'method',
+                 'completion', 'compact', 'warm_start', '_normalize', '_elements', '_indices', '_element_index',
+                 '_size', '_matrix', '_input_locations', '_missing_comparisons', '_missing_locations', '_lambda_max',
+                 '_priority_vector', '_node_parent', '_node_children', '_node_precision', '_node_weights',
+                 '_node_elements', '_node_vector', '_stale', '_global_weight', '_local_weight', 'consistency_ratio',
+                 '_global_weights', '_local_weights', '_target_weights',
+                 # Instances can still be weakly referenced and given other attributes, whose dictionary is
+                 # only created when the first such attribute is set
+                 '__weakref__', '__dict__')
 
-    def __init__(self, name, comparisons, precision=4, random_index='dd', iterations=100, tolerance=0.0001, cr=True):
+    @_instrumented('build')
+    def __init__(self, name, comparisons, precision=4, random_index='dd', iterations=100, tolerance=0.0001, cr=True,
+                 method='squaring', completion='cyclic', compact=False, warm_start=None):
         self.name = name
         self.comparisons = comparisons
         self.precision = precision
@@ -40,27 +926,96 @@ class Compare:
         self.iterations = iterations
         self.tolerance = tolerance
         self.cr = cr
+        self.method = method.lower()
+        self.completion = completion.lower()
+        self.compact = compact
+        self.warm_start = warm_start
+
+        self._setup()
+        self._complete_and_compute()
+
+        self._target_weights = self._node_weights if self._global_weight == 1.0 else None
+
+    def __getitem__(self, item):
+        return getattr(self, item)
 
+    @classmethod
+    def from_values(cls, name, values, alternatives, precision=4):
+        """
+        Returns a compact Compare object of the measured values of a number of alternatives, backed by a numpy array
+        rather than a dictionary. Compare objects created from the same alternatives share a single index of them,
+        and the target weights of a compact Compare object whose children all share the same index are synthesized
+        using vector operations rather than dictionaries, so hierarchies can rate hundreds of thousands of alternatives.
+        :param name: string, the name of the Compare object;
+            if the object has a parent, this name MUST be included as an element of its parent
+        :param values: numpy array, the measured value of each alternative; may be a numpy memmap,
+            in which case float64 values are read from the file rather than copied into memory;
+            'update_comparisons()' writes new values into this array in place, unless it is read-only,
+            in which case the array is first copied into memory
+        :param alternatives: list or tuple, the name of each alternative, in the order of 'values'
+        :param precision: integer, number of decimal places used when computing the weights; default is 4
+        """
+        values = np.asarray(values, float)
+        if values.ndim != 1 or len(values) != len(alternatives):
+            msg = f'The values of {name} must be a one-dimensional array with one value for each alternative.'
+            raise ValueError(msg)
+        return cls(name, _ValueMapping(_get_element_index(list(alternatives)), values), precision, compact=True)
+
+    @classmethod
+    async def acreate(cls, *args, executor=None, **kwargs):
+        """
+        Returns a new Compare object, created in an executor so that computing its missing comparisons, priority vector
+        and consistency ratio does not block the running event loop. Compare objects created concurrently,
+        such as with 'asyncio.gather()', are computed concurrently by the executor.
+        Example: compare = await ahpy.Compare.acreate('Drinks', comparisons, precision=3)
+        :param args: the positional arguments necessary to create the Compare object
+        :param executor: concurrent.futures.Executor, the executor in which to create the Compare object,
+            such as a ThreadPoolExecutor or a ProcessPoolExecutor; if None, the default executor
+            of the event loop is used; default is None
+        :param kwargs: the keyword arguments necessary to create the Compare object
+        """
+        loop = asyncio.get_running_loop()
+        compare = await loop.run_in_executor(executor, functools.partial(cls, *args, **kwargs))
+        if compare.compact:
+            compare._share_elements()
+        return compare
+
+    def _setup(self):
+        """
+        Initializes the properties of the Compare object that are derived from its parameters, then checks the input
+        and builds the elements, the matrix and the locations of any missing comparisons.
+        """
         self._normalize = not isinstance(next(iter(self.comparisons)), tuple)
         self._elements = []
-        self._pairs = []
+        self._indices = {}
+        self._element_index = None
         self._size = None
         self._matrix = None
+        self._input_locations = None
         self._missing_comparisons = None
+        self._missing_locations = None
+        self._lambda_max = None
+        self._priority_vector = None
 
         self._node_parent = None
         self._node_children = None
         self._node_precision = self.precision
         self._node_weights = None
+        self._node_elements = None
+        self._node_vector = None
+        self._stale = False
 
-        self.global_weight = 1.0
-        self.local_weight = self.global_weight
+        self._global_weight = 1.0
+        self._local_weight = self._global_weight
         self.consistency_ratio = None
-        self.global_weights = None
-        self.local_weights = None
-        self.target_weights = None
+        self._global_weights = None
+        self._local_weights = None
+        self._target_weights = None
 
+        _check_method(self.method)
+        _check_method(self.completion, COMPLETION_METHODS)
         self._check_input()
+        self._check_warm_start()
         if self._normalize:
             self._build_normalized_elements()
             self._check_size()
@@ -70,22 +1025,76 @@ class Compare:
             self._check_size()
             self._insert_comparisons()
             self._build_matrix()
+        if self.compact:
+            self._share_elements()
         self._get_missing_comparisons()
-        if self._missing_comparisons:
-            self._complete_matrix()
-        self._compute()
+        self._copy_warm_start()
 
-        self.target_weights = self._node_weights if self.global_weight == 1.0 else None
+    @property
+    def global_weight(self):
+        self._refresh()
+        return self._global_weight
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    @global_weight.setter
+    def global_weight(self, value):
+        self._global_weight = value
+
+    @property
+    def local_weight(self):
+        self._refresh()
+        return self._local_weight
+
+    @local_weight.setter
+    def local_weight(self, value):
+        self._local_weight = value
 
-    def _check_input(self):
+    @property
+    def local_weights(self):
+        if self._local_weights is None and self._priority_vector is not None:
+            order = np.argsort(-self._priority_vector, kind='stable')
+            return dict(zip([self._elements[index] for index in order], self._priority_vector[order]))
+        return self._local_weights
+
+    @local_weights.setter
+    def local_weights(self, value):
+        self._local_weights = value
+
+    @property
+    def global_weights(self):
+        self._refresh()
+        if self._global_weights is None and self._priority_vector is not None:
+            return {key: np.round(self._global_weight * value, self.precision)
+                    for key, value in self.local_weights.items()}
+        return self._global_weights
+
+    @global_weights.setter
+    def global_weights(self, value):
+        self._global_weights = value
+
+    @property
+    def target_weights(self):
+        self._refresh()
+        if self._target_weights is None and self._node_parent is None:
+            return self._get_node_weights()
+        return self._target_weights
+
+    @target_weights.setter
+    def target_weights(self, value):
+        self._target_weights = value
+
+    def _check_input(self, comparisons=None):
         """
         Raises a ValueError if an input value is not greater than zero;
         raises a TypeError if an input value cannot be cast to a float.
+        :param comparisons: dictionary, the comparisons to check; default is the input 'comparisons' dictionary
         """
-        for key, value in self.comparisons.items():
+        comparisons = comparisons or self.comparisons
+        if isinstance(comparisons, _ValueMapping):
+            if not np.all(comparisons.values > 0):
+                msg = 'All input values must be greater than zero.'
+                raise ValueError(msg)
+            return
+        for key, value in comparisons.items():
             try:
                 if not float(value) > 0:
                     msg = f'{key}: {value} is an invalid input. All input values must be greater than zero.'
@@ -94,94 +1103,304 @@ class Compare:
                 msg = f'{key}: {value} is an invalid input. All input values must be numeric.'
                 raise TypeError(msg)
 
+    def _check_warm_start(self):
+        """
+        Raises a ValueError if the warm start is a string other than 'llsm' or a dictionary containing a value
+        that is not greater than zero; raises a TypeError if it is neither a dictionary, a Compare object nor a string.
+        """
+        if self.warm_start is None or isinstance(self.warm_start, Compare):
+            return
+        elif isinstance(self.warm_start, str):
+            if self.warm_start.lower() != 'llsm':
+                msg = f"'{self.warm_start}' is an invalid warm start. Valid warm starts are: " \
+                      "llsm, a dictionary or a Compare object."
+                raise ValueError(msg)
+        elif isinstance(self.warm_start, dict):
+            self._check_input(self.warm_start)
+        else:
+            msg = 'The warm start must be a dictionary, a Compare object or llsm.'
+            raise TypeError(msg)
+
     def _build_elements(self):
         """
-        Creates an empty 'pairs' dictionary that contains all possible permutations
-        of those elements found within the keys of the input 'comparisons' dictionary.
+        Creates a list of those elements found within the keys of the input 'comparisons' dictionary,
+        along with a dictionary mapping each element to its index in the matrix.
         """
-        for key in self.comparisons:
-            for element in key:
-                if element not in self._elements:
-                    self._elements.append(element)
-        self._pairs = dict.fromkeys(itertools.permutations(self._elements, 2))
+        self._elements = list(dict.fromkeys(itertools.chain.from_iterable(self.comparisons)))
+        self._indices = {element: index for index, element in enumerate(self._elements)}
         self._size = len(self._elements)
 
     def _build_normalized_elements(self):
         """
-        Creates a list of those elements found within the keys of the input 'comparisons' dictionary.
+        Creates a list of those elements found within the keys of the input 'comparisons' dictionary,
+        along with a dictionary mapping each element to its index in the matrix.
         """
-        self._elements = list(self.comparisons)
-        self._pairs = {}
+        if isinstance(self.comparisons, _ValueMapping):
+            self._element_index = self.comparisons.element_index
+            self._elements = self._element_index.elements
+            self._indices = self._element_index.indices
+        else:
+            self._elements = list(self.comparisons)
+            self._indices = {element: index for index, element in enumerate(self._elements)}
         self._size = len(self._elements)
 
+    def _share_elements(self):
+        """
+        Replaces the list of elements and the dictionary of element indices of the Compare object
+        with those shared by all compact Compare objects comparing the same elements.
+        """
+        if self._element_index is None:
+            self._element_index = _get_element_index(self._elements)
+        self._elements = self._element_index.elements
+        self._indices = self._element_index.indices
+
     def _check_size(self):
         """
         Raises a ValueError if a consistency ratio is requested and
         the chosen random index does not support the size of the matrix.
         """
-        if not self._normalize and self.cr and \
-                ((self.random_index == 'saaty' and self._size > 15) or self._size > 100):
-            msg = f"The input matrix of {self._size} x {self._size} is too large for {self.random_index}" \
-                  " and a consistency ratio cannot be computed.\n" \
-                  "\tThe maximum matrix size supported by the 'saaty' random index is 15 x 15;\n" \
-                  "\tthe maximum matrix size supported by the 'dd' random index is 100 x 100.\n" \
-                  "\tTo compute the priority vector of the matrix without a consistency ratio\n," \
-                  "\tuse the 'cr=False' argument."
-            raise ValueError(msg)
+        if not self._normalize and self.cr:
+            _check_random_index_size(self._size, self.random_index)
 
     def _insert_comparisons(self):
         """
-        Fills the entries of the 'pairs' dictionary with the corresponding comparison values
-        of the input 'comparisons' dictionary or their computed reciprocals.
+        Creates the 'input_locations' tuple containing the row indices, column indices and values
+        of the input 'comparisons' dictionary as numpy arrays.
         """
-        for key, value in self.comparisons.items():
-            inverse_key = key[::-1]
-            self._pairs[key] = float(value)
-            self._pairs[inverse_key] = np.reciprocal(float(value))
+        self._input_locations = _comparison_locations(self.comparisons, self._indices)
 
     def _build_matrix(self):
         """
-        Creates a correctly-sized numpy matrix of 1s, then fills the matrix with values from the 'pairs' dictionary.
+        Creates a correctly-sized numpy matrix of NaNs with a diagonal of 1s, then fills the matrix with
+        the values of the input comparisons and their reciprocals. Missing comparisons remain NaN.
         """
-        self._matrix = np.ones((self._size, self._size))
-        for pair, value in self._pairs.items():
-            location = tuple(self._elements.index(elements) for elements in pair)
-            self._matrix[location] = value
+        rows, columns, values = self._input_locations
+        self._matrix = np.full((self._size, self._size), np.nan)
+        np.fill_diagonal(self._matrix, 1.0)
+        self._matrix[rows, columns] = values
+        self._matrix[columns, rows] = np.reciprocal(values)
 
     def _build_normalized_matrix(self):
         """
         Creates a numpy matrix of values from the input 'comparisons' dictionary.
         """
-        self._matrix = np.array(tuple(value for value in self.comparisons.values()), float)
+        if isinstance(self.comparisons, _ValueMapping):
+            self._matrix = self.comparisons.values
+        else:
+            self._matrix = np.array(tuple(value for value in self.comparisons.values()), float)
 
     def _get_missing_comparisons(self):
         """
         Creates the 'missing comparisons' dictionary by populating its keys with the unique comparisons
-        missing from the input 'comparisons' dictionary and populating its values with 1s.
+        missing from the input 'comparisons' dictionary and populating its values with 1s,
+        along with the 'missing_locations' tuple containing their row and column indices as numpy arrays.
         """
-        missing_comparisons = [key for key, value in self._pairs.items() if not value]
-        for elements in missing_comparisons:
-            del missing_comparisons[missing_comparisons.index(elements[::-1])]
-        self._missing_comparisons = dict.fromkeys(missing_comparisons, 1)
+        if self._normalize:
+            self._missing_locations = (np.empty(0, int), np.empty(0, int))
+        else:
+            rows, columns = np.nonzero(np.isnan(self._matrix))
+            upper = rows < columns
+            self._missing_locations = (rows[upper], columns[upper])
+        self._missing_comparisons = dict.fromkeys(
+            ((self._elements[row], self._elements[column]) for row, column in zip(*self._missing_locations)), 1)
 
-    def _complete_matrix(self):
+    @_instrumented('completion')
+    def _complete_matrix(self, warm=False):
         """
-        Optimally completes an incomplete pairwise comparison matrix according to the algorithm described in
+        Optimally completes an incomplete pairwise comparison matrix using the completion algorithm of the object.
+        By default (completion='cyclic'), uses the cyclic coordinates algorithm described in
         Bozóki, S., Fülöp, J. and Rónyai, L., 'On optimal completion of incomplete pairwise comparison matrices,'
         Mathematical and Computer Modelling, 52:1–2, 2010, pp. 318-333. (https://doi.org/10.1016/j.mcm.2010.02.047)
+        If the completion of the object is 'llsm', uses the logarithmic least squares method described in
+        Bozóki, S., Fülöp, J. and Rónyai, L. (see '_complete_matrix_llsm()');
+        if the completion of the object is 'newton', minimizes the largest eigenvalue of the matrix with respect to
+        all missing comparisons at once using Newton's method (see '_complete_matrix_newton()').
+        :param warm: boolean, whether the current values of the missing comparisons are a warm start,
+            in which case the 'newton' algorithm starts from them rather than from the logarithmic least squares
+            solution and the 'cyclic' algorithm searches for each missing comparison near its current value;
+            default is False
         """
+        if self.completion == 'llsm':
+            self._complete_matrix_llsm()
+            return
+        elif self.completion == 'newton':
+            self._complete_matrix_newton(warm)
+            return
+
+        self._set_matrix()
         last_iteration = np.array(tuple(self._missing_comparisons.values()))
         difference = np.inf
         while difference > self.tolerance:
-            self._minimize_coordinate_values()
+            _count('completion_sweeps')
+            self._minimize_coordinate_values(warm)
             current_iteration = np.array(tuple(self._missing_comparisons.values()))
             difference = np.linalg.norm(last_iteration - current_iteration)
             last_iteration = current_iteration
 
-    def _minimize_coordinate_values(self):
+    def _copy_warm_start(self):
+        """
+        Replaces a dictionary or Compare object warm start with a new dictionary of the starting value of each
+        missing comparison, so that the Compare object keeps no reference to another Compare object or its hierarchy.
+        Missing comparisons for which a dictionary or a Compare object gives no value start at 1.
+        """
+        if self.warm_start is not None and not isinstance(self.warm_start, str):
+            self.warm_start = {key: self._get_warm_start_value(key) for key in self._missing_comparisons}
+
+    def _set_warm_start(self):
+        """
+        Sets the values of the missing comparisons to those given by the warm start of the Compare object.
+        """
+        if isinstance(self.warm_start, str):
+            self._complete_matrix_llsm()
+            return
+        values = np.fromiter((self.warm_start[key] for key in self._missing_comparisons), float,
+                             len(self._missing_comparisons))
+        self._set_missing_comparisons(np.log(values))
+
+    def _get_warm_start_value(self, key):
+        """
+        Returns the value given by a dictionary or Compare object warm start for a missing comparison, or 1.
+        :param key: tuple, the elements of the missing comparison
+        """
+        first, second = key
+        if isinstance(self.warm_start, Compare):
+            source = self.warm_start
+            if first not in source._indices or second not in source._indices:
+                return 1.0
+            row, column = source._indices[first], source._indices[second]
+            if source._normalize:
+                return source._matrix[row] / source._matrix[column]
+            return source._matrix[row, column]
+        elif key in self.warm_start:
+            return float(self.warm_start[key])
+        elif key[::-1] in self.warm_start:
+            return 1 / float(self.warm_start[key[::-1]])
+        return 1.0
+
+    def _set_missing_comparisons(self, log_values):
+        """
+        Sets the values of the 'missing_comparisons' dictionary and their locations in the matrix.
+        :param log_values: numpy array, the natural logarithms of the missing comparison values
+        """
+        rows, columns = self._missing_locations
+        values = np.exp(log_values)
+        self._matrix[rows, columns] = values
+        self._matrix[columns, rows] = np.reciprocal(values)
+        self._missing_comparisons = dict(zip(self._missing_comparisons, values))
+
+    def _complete_matrix_llsm(self):
+        """
+        Completes the matrix in closed form using the logarithmic least squares method, as described in
+        Bozóki, S., Fülöp, J. and Rónyai, L. (see '_complete_matrix()'): the logarithms of the weights
+        are the solution of a linear system defined by the Laplacian matrix of the graph of input comparisons,
+        and each missing comparison is set to the ratio of the weights of its elements.
+        Raises a ValueError if the graph of input comparisons is not connected.
+        Returns the natural logarithms of the computed missing comparison values.
+        """
+        known = ~np.isnan(self._matrix)
+        np.fill_diagonal(known, False)
+        if spc.connected_components(known, directed=False)[0] > 1:
+            msg = f'The input comparisons of {self.name} do not connect all of its elements, ' \
+                  'so the missing comparisons cannot be computed.'
+            raise ValueError(msg)
+
+        # Adding the all-ones matrix makes the Laplacian non-singular and fixes the sum of the log weights at zero
+        laplacian = np.diag(np.sum(known, axis=1)) - known + 1 / self._size
+        log_weights = np.linalg.solve(laplacian, np.sum(np.log(self._matrix, where=known, out=np.zeros_like(
+            self._matrix)), axis=1))
+
+        rows, columns = self._missing_locations
+        log_values = log_weights[rows] - log_weights[columns]
+        self._set_missing_comparisons(log_values)
+        return log_values
+
+    def _complete_matrix_newton(self, warm=False):
+        """
+        Completes the matrix by minimizing its largest eigenvalue with respect to the logarithms of all missing
+        comparisons at once. The largest eigenvalue is a strictly convex function of these logarithms (Bozóki et al.),
+        so Newton's method, using the analytic gradient and Hessian of the eigenvalue and starting from the
+        logarithmic least squares solution, converges in a few iterations. The algorithm stops when the difference
+        between the norms of two successive sets of missing comparisons is less than the tolerance of the object.
+        :param warm: boolean, whether to start from the current values of the missing comparisons rather than
+            from the logarithmic least squares solution; default is False
+        """
+
+        def lambda_max(x):
+            """
+            Returns the largest eigenvalue of the matrix, given the logarithms of the missing comparisons.
+            :param x: numpy array, the logarithms of the missing comparisons
+            """
+            self._matrix[rows, columns] = np.exp(x)
+            self._matrix[columns, rows] = np.exp(-x)
+            _count('objective_evaluations')
+            return np.max(np.real(_eigvals(self._matrix)))
+
+        def derivatives(x):
+            """
+            Returns the largest eigenvalue of the matrix, along with its gradient and Hessian
+            with respect to the logarithms of the missing comparisons.
+            :param x: numpy array, the logarithms of the missing comparisons
+            """
+            upper, lower = np.exp(x), np.exp(-x)
+            self._matrix[rows, columns] = upper
+            self._matrix[columns, rows] = lower
+            _count('objective_evaluations')
+            _count('eigen_solves')
+            eigenvalues, right = spl.eig(self._matrix)
+            order = np.argsort(-np.real(eigenvalues))
+            eigenvalues, right = eigenvalues[order], right[:, order]
+            # The rows of the inverse of the right eigenvectors are the matching, biorthonormal left eigenvectors
+            left = np.linalg.inv(right)
+
+            # Rows and columns of the principal row and column of the left @ derivative @ right products
+            first_row = upper[:, np.newaxis] * left[0, rows][:, np.newaxis] * right[columns, :] - \
+                lower[:, np.newaxis] * left[0, columns][:, np.newaxis] * right[rows, :]
+            first_column = upper[:, np.newaxis] * left[:, rows].T * right[columns, 0][:, np.newaxis] - \
+                lower[:, np.newaxis] * left[:, columns].T * right[rows, 0][:, np.newaxis]
+            gradient = np.real(first_row[:, 0])
+
+            gaps = eigenvalues[0] - eigenvalues[1:]
+            hessian = (first_row[:, 1:] / gaps) @ first_column[:, 1:].T
+            hessian = np.real(hessian + hessian.T)
+            hessian[np.diag_indices_from(hessian)] += np.real(upper * left[0, rows] * right[columns, 0] +
+                                                              lower * left[0, columns] * right[rows, 0])
+            return np.real(eigenvalues[0]), gradient, hessian
+
+        rows, columns = self._missing_locations
+        if warm:
+            x = np.log(np.fromiter(self._missing_comparisons.values(), float, len(self._missing_comparisons)))
+        else:
+            x = self._complete_matrix_llsm()
+        difference = np.inf
+        # The iteration limit guards against a non-converging sequence of steps
+        for _ in range(100):
+            if difference <= self.tolerance:
+                break
+            _count('completion_sweeps')
+            value, gradient, hessian = derivatives(x)
+            try:
+                step = -np.linalg.solve(hessian, gradient)
+            except np.linalg.LinAlgError:
+                step = -gradient
+            if gradient @ step >= 0:
+                step = -gradient
+            # Backtrack until the step sufficiently decreases the largest eigenvalue
+            size = 1.0
+            while size > 1e-10 and lambda_max(x + size * step) > value + 1e-4 * size * (gradient @ step):
+                size /= 2
+            difference = np.linalg.norm(np.exp(x + size * step) - np.exp(x))
+            x = x + size * step
+        self._set_missing_comparisons(x)
+
+    def _minimize_coordinate_values(self, adaptive=False):
         """
         Computes the minimum value for each missing value of the 'missing_comparisons' dictionary
-        using the cyclic coordinates method described in Bozóki et al.
+        using the cyclic coordinates method described in Bozóki et al. The matrix must already contain the current
+        values of the missing comparisons, and each minimum is written to the matrix as soon as it is found.
+        Each change to the matrix changes only two of its values, so for larger matrices the largest eigenvalue
+        is found by power iteration starting from the principal eigenvector of the previous matrix.
+        :param adaptive: boolean, whether to search for each minimum within a factor of '_WARM_START_RATIO'
+            of the current value before searching the whole solution space; default is False
         """
 
         def lambda_max(x, x_location):
@@ -193,84 +1412,142 @@ class Compare:
             inverse_x_location = x_location[::-1]
             self._matrix[x_location] = x
             self._matrix[inverse_x_location] = np.reciprocal(x)
-            return np.max(np.linalg.eigvals(self._matrix))
+            _count('objective_evaluations')
+            if perron_vector is not None:
+                return _perron_root(self._matrix, perron_vector)
+            return np.max(_eigvals(self._matrix))
 
+        perron_vector = np.full(self._size, 1 / self._size) if self._size >= _PERRON_ITERATION_SIZE else None
         # The upper bound of the solution space is set to be 10 times the largest value of the matrix.
         upper_bound = np.nanmax(self._matrix) * 10
 
-        for comparison in self._missing_comparisons:
-            comparison_location = tuple(self._elements.index(element) for element in comparison)
+        for comparison, comparison_location in zip(tuple(self._missing_comparisons),
+                                                   zip(*self._missing_locations)):
             with warnings.catch_warnings():
                 warnings.filterwarnings('ignore', category=np.exceptions.ComplexWarning)
-                self._set_matrix(comparison)
+                bounds = (0, upper_bound)
+                value = self._missing_comparisons[comparison]
+                if adaptive and value * _WARM_START_RATIO < upper_bound:
+                    bounds = (value / _WARM_START_RATIO, value * _WARM_START_RATIO)
                 optimal_solution = spo.minimize_scalar(lambda_max, args=(comparison_location,),
-                                                       method='bounded', bounds=(0, upper_bound))
-            self._missing_comparisons[comparison] = np.real(optimal_solution.x)
+                                                       method='bounded', bounds=bounds)
+                # A minimum at the edge of the narrower bounds may lie beyond them, so the whole space is searched
+                if bounds[0] > 0 and np.isclose(np.real(optimal_solution.x), bounds, rtol=1e-4, atol=1e-5).any():
+                    optimal_solution = spo.minimize_scalar(lambda_max, args=(comparison_location,),
+                                                           method='bounded', bounds=(0, upper_bound))
+            optimal_value = np.real(optimal_solution.x)
+            self._matrix[comparison_location] = optimal_value
+            self._matrix[comparison_location[::-1]] = np.reciprocal(optimal_value)
+            self._missing_comparisons[comparison] = optimal_value
 
-    def _set_matrix(self, comparison):
+    def _set_matrix(self):
         """
-        Sets the value of every missing comparison in the comparison matrix (other than the current comparison)
+        Sets the value of every missing comparison in the comparison matrix
         to its current value in the 'missing_comparisons' dictionary or its reciprocal.
-        :param comparison: tuple, a key from the 'missing_comparisons' dictionary
         """
-        for key, value in self._missing_comparisons.items():
-            if key != comparison:
-                location = tuple(self._elements.index(element) for element in key)
-                inverse_location = location[::-1]
-                self._matrix[location] = value
-                self._matrix[inverse_location] = np.reciprocal(value)
+        rows, columns = self._missing_locations
+        values = np.fromiter(self._missing_comparisons.values(), float, len(self._missing_comparisons))
+        self._matrix[rows, columns] = values
+        self._matrix[columns, rows] = np.reciprocal(values)
+
+    def _complete_and_compute(self):
+        """
+        Completes the matrix and computes the weights and consistency ratio of the Compare object, or restores them
+        from the result cache if a Compare object with the same inputs has already been computed;
+        see 'enable_cache()'.
+        """
+        key = _result_cache.get_key(self) if _result_cache is not None else None
+        results = _result_cache.get(key) if key is not None else None
+        if results is None and self._missing_comparisons:
+            if self.warm_start is not None:
+                self._set_warm_start()
+            self._complete_matrix(self.warm_start is not None)
+        # The warm start is only needed to complete the matrix
+        self.warm_start = None
+        if results is not None:
+            self._restore_results(results)
+            return
+        self._compute()
+        if key is not None:
+            _result_cache.put(key, {'matrix': self._matrix.copy(),
+                                    'missing_comparisons': tuple(self._missing_comparisons.values()),
+                                    'priority_vector': self._priority_vector.copy(),
+                                    'lambda_max': self._lambda_max,
+                                    'consistency_ratio': self.consistency_ratio})
+
+    def _restore_results(self, results):
+        """
+        Sets the completed matrix, missing comparisons, weights and consistency ratio of the Compare object
+        from the results of an identical Compare object. The matrix of a Compare object created by 'from_values()'
+        remains its values array.
+        :param results: dictionary, the cached results
+        """
+        if not isinstance(self.comparisons, _ValueMapping):
+            self._matrix = results['matrix'].copy()
+        self._missing_comparisons = dict(zip(self._missing_comparisons, results['missing_comparisons']))
+        self._lambda_max = results['lambda_max']
+        self.consistency_ratio = results['consistency_ratio']
+        self._set_weights(results['priority_vector'].copy())
 
-    def _compute(self):
+    def _compute(self, initial_vector=None):
         """
         Runs all functions necessary for building the local weights and consistency ratio of the Compare object.
+        :param initial_vector: numpy array, the eigenvector from which to start the 'power' method; default is None
         """
         if not self._normalize:
-            priority_vector = self._compute_priority_vector(self._matrix, self.iterations)
+            priority_vector = self._compute_priority_vector(initial_vector)
             if self.cr:
                 self._compute_consistency_ratio()
         else:
             priority_vector = np.divide(self._matrix, np.sum(self._matrix, keepdims=True)).round(self.precision)
             self.consistency_ratio = 0.0
-        weights = dict(zip(self._elements, priority_vector))
-        self.local_weights = dict(sorted(weights.items(), key=lambda item: item[1], reverse=True))
-        self.global_weights = self.local_weights.copy()
-        self._node_weights = self.local_weights.copy()
-        self.target_weights = self._node_weights
-
-    def _compute_priority_vector(self, matrix, iterations, comp_eigenvector=None):
-        """
-        Returns the priority vector of the Compare object.
-        :param matrix: numpy matrix, the matrix from which to derive the priority vector
-        :param iterations: integer, number of iterations to run before the function stops
-        :param comp_eigenvector: numpy array, a comparison eigenvector used during recursion
-        """
-        # Compute the principal eigenvector by normalizing the rows of a newly squared matrix
-        sq_matrix = np.linalg.matrix_power(matrix, 2)
-        row_sum = np.sum(sq_matrix, axis=1)
-        total_sum = np.sum(sq_matrix)
-        principal_eigenvector = np.divide(row_sum, total_sum)
-
-        # Create a zero matrix as the comparison eigenvector if this is the first iteration
-        if comp_eigenvector is None:
-            comp_eigenvector = np.zeros(self._size)
-
-        # Compute the difference between the principal and comparison eigenvectors
-        remainder = np.subtract(principal_eigenvector, comp_eigenvector).round(self.precision)
-
-        # If the difference between the two eigenvectors is zero (after rounding to the specified precision),
-        # set the current principal eigenvector as the priority vector for the matrix...
-        if not np.any(remainder):
-            return principal_eigenvector.round(self.precision)
-
-        # ...else recursively run the function until either there is no difference between the rounded
-        # principal and comparison eigenvectors, or until the predefined number of iterations has been met,
-        # in which case set the last principal eigenvector as the priority vector
-        iterations -= 1
-        if iterations > 0:
-            return self._compute_priority_vector(sq_matrix, iterations, principal_eigenvector)
+        self._set_weights(priority_vector)
+
+    def _set_weights(self, priority_vector):
+        """
+        Sets the priority vector of the Compare object and builds its local, global and node weights.
+        :param priority_vector: numpy array, the priority vector of the Compare object
+        """
+        self._priority_vector = priority_vector
+        if self.compact:
+            self._local_weights = self._global_weights = self._node_weights = None
         else:
-            return principal_eigenvector.round(self.precision)
+            weights = dict(zip(self._elements, priority_vector))
+            self._local_weights = dict(sorted(weights.items(), key=lambda item: item[1], reverse=True))
+            self._global_weights = self._local_weights.copy()
+            self._node_weights = self._local_weights.copy()
+        self._target_weights = self._node_weights
+
+    @_instrumented('priority_vector')
+    def _compute_priority_vector(self, initial_vector=None):
+        """
+        Returns the priority vector of the Compare object using the method of the object:
+        'squaring' normalizes the rows of the repeatedly squared matrix until the rounded principal eigenvector
+        stops changing or 'iterations' is met; 'power' runs power iteration with an early exit; 'eigen' computes
+        the principal eigenvector and eigenvalue in a single eigendecomposition; 'geometric' normalizes the
+        geometric means of the rows of the matrix.
+        The 'power' and 'eigen' methods also set the '_lambda_max' property used by '_compute_consistency_ratio()'.
+        If the matrix is consistent, which every matrix with fewer than three rows is, the principal eigenvector is
+        exactly the normalized geometric means of its rows and the principal eigenvalue is its size, so both are
+        returned directly by every method, without any iteration or eigendecomposition.
+        :param initial_vector: numpy array, the eigenvector from which to start the 'power' method; default is None
+        """
+        if _is_consistent(self._matrix):
+            self._lambda_max = np.float64(self._size)
+            return _consistent_priority_vectors(self._matrix[np.newaxis], self.precision)[0]
+
+        if self.method == 'squaring':
+            self._lambda_max = None
+            return _squaring_priority_vector(self._matrix, self.iterations, self.precision)
 
+        initial_vectors = initial_vector[np.newaxis] if initial_vector is not None else None
+        priority_vectors, lambda_max = _compute_method_priority_vectors(self._matrix[np.newaxis], self.method,
+                                                                        self.iterations, self.precision,
+                                                                        initial_vectors)
+        self._lambda_max = lambda_max[0] if lambda_max is not None else None
+        return priority_vectors[0]
+
+    @_instrumented('consistency_ratio')
     def _compute_consistency_ratio(self):
         """
         Sets the 'consistency_ratio' property of the Compare object, using random index estimates from
@@ -283,47 +1560,36 @@ class Compare:
         if self._size < 3:
             self.consistency_ratio = 0.0
             return
-        if self.random_index == 'saaty':
-            ri_dict = {3: 0.52, 4: 0.89, 5: 1.11, 6: 1.25, 7: 1.35, 8: 1.40, 9: 1.45,
-                       10: 1.49, 11: 1.52, 12: 1.54, 13: 1.56, 14: 1.58, 15: 1.59}
-        elif self.random_index == 'dd':
-            ri_dict = {3: 0.4914, 4: 0.8286, 5: 1.0591, 6: 1.1797, 7: 1.2519,
-                       8: 1.3171, 9: 1.3733, 10: 1.4055, 11: 1.4213, 12: 1.4497,
-                       13: 1.4643, 14: 1.4822, 15: 1.4969, 16: 1.5078, 17: 1.5153,
-                       18: 1.5262, 19: 1.5313, 20: 1.5371, 25: 1.5619, 30: 1.5772,
-                       40: 1.5976, 50: 1.6102, 60: 1.6178, 70: 1.6237, 80: 1.6277,
-                       90: 1.6213, 100: 1.6339}
-        else:
+        random_index = _get_random_index(self._size, self.random_index)
+        if random_index is None:
             return
 
-        try:
-            random_index = ri_dict[self._size]
-        # If the size of the comparison matrix falls between two computed estimates, compute a weighted estimate
-        except KeyError:
-            s = tuple(ri_dict.keys())
-            smaller = s[bisect.bisect_left(s, self._size) - 1]
-            larger = s[bisect.bisect_right(s, self._size)]
-            estimate = (ri_dict[larger] - ri_dict[smaller]) / (larger - smaller)
-            random_index = estimate * (self._size - smaller) + ri_dict[smaller]
-
-        # Find the Perron-Frobenius eigenvalue of the matrix
-        lambda_max = np.max(np.linalg.eigvals(self._matrix))
+        # Find the Perron-Frobenius eigenvalue of the matrix, unless the priority vector method has already done so
+        lambda_max = self._lambda_max
+        if lambda_max is None:
+            lambda_max = np.max(_eigvals(self._matrix))
         consistency_index = (lambda_max - self._size) / (self._size - 1)
         # The absolute value avoids confusion in those rare cases where a small negative float is rounded to -0.0
         self.consistency_ratio = np.abs(np.real(consistency_index / random_index).round(self.precision))
 
-    def add_children(self, children):
+    def add_children(self, children, lazy=False):
         """
         Sets the input Compare objects as children of the current Compare object, assigns itself as their parent,
         then updates the global and target weights of the new hierarchy.
         NB: A child Compare object's name MUST be included as an element of the current Compare object.
         :param children: list or tuple, Compare objects to form the children of the current Compare object
+        :param lazy: boolean, whether to defer updating the weights of the hierarchy until they are next accessed,
+            so that building a hierarchy from many calls to 'add_children()' only computes the weights once;
+            default is False
         """
         self._node_children = children
         self._check_children()
         for child in self._node_children:
             child._node_parent = self
-        self._recompute()
+        if lazy:
+            self._mark_stale()
+        else:
+            self._recompute()
 
     def _check_children(self):
         """
@@ -334,6 +1600,7 @@ class Compare:
                 msg = 'A Compare object is either misconfigured or missing from the hierarchy.'
                 raise TypeError(msg)
 
+    @_instrumented('recompute')
     def _recompute(self):
         """
         Calls all functions necessary for building the target weights of the Compare object,
@@ -347,166 +1614,860 @@ class Compare:
         if self._node_parent:
             self._node_parent._recompute()
 
-    def _set_node_precision(self):
+    def _get_root(self):
+        """
+        Returns the Compare object at the top of the hierarchy.
+        """
+        node = self
+        while node._node_parent:
+            node = node._node_parent
+        return node
+
+    def _mark_stale(self):
+        """
+        Marks the Compare object and its ancestors as needing their weights recomputed.
+        """
+        node = self
+        while node:
+            node._stale = True
+            node = node._node_parent
+
+    def _refresh(self):
+        """
+        Recomputes the weights of the whole hierarchy if any of its Compare objects have been marked as stale.
+        """
+        root = self._get_root()
+        if root._stale:
+            root._recompute_hierarchy()
+
+    @_instrumented('recompute')
+    def _recompute_hierarchy(self):
+        """
+        Builds the node and target weights of every Compare object in the hierarchy below the current Compare object,
+        from the bottom up, then updates all of their global and local weights from the top down,
+        visiting each Compare object once.
+        """
+        nodes = [self]
+        for node in nodes:
+            nodes.extend(node._node_children or ())
+        for node in reversed(nodes):
+            node._stale = False
+            if node._node_children:
+                node._set_node_precision()
+                node._compute_node_weights()
+                node._set_target_weights()
+        self._compute_global_and_local_weights()
+
+    def _set_node_precision(self):
+        """
+        Sets the '_node_precision' property of the Compare object by selecting the lowest precision of its children.
+        """
+        lowest_precision = np.min([child._node_precision for child in self._node_children])
+        if lowest_precision < self.precision:
+            self._node_precision = lowest_precision
+        else:
+            self._node_precision = self.precision
+
+    def _get_node_weights(self):
+        """
+        Returns the '_node_weights' dictionary of the Compare object, which for a compact Compare object
+        is built from its node weights array or, if it has no children, from its local weights.
+        """
+        if self._node_weights is not None:
+            return self._node_weights
+        elif self._node_vector is not None:
+            order = np.argsort(-self._node_vector, kind='stable')
+            return dict(zip([self._node_elements[index] for index in order], self._node_vector[order]))
+        return self.local_weights
+
+    def _get_node_vector(self):
+        """
+        Returns the elements of the node weights of the Compare object as a list and the node weights themselves
+        as a numpy array in the same order. The elements of a compact Compare object without children are its
+        shared list of elements, in their original order; otherwise they are in the order of the local weights.
+        """
+        if self._node_vector is not None:
+            return self._node_elements, self._node_vector
+        elif self.compact and self._element_index is not None:
+            return self._elements, self._priority_vector
+        return list(self.local_weights), np.fromiter(self.local_weights.values(), float, len(self.local_weights))
+
+    def _get_children_by_name(self):
+        """
+        Returns a dictionary mapping the name of each child of the Compare object to the child,
+        keeping the first child of any name that is shared by several children.
+        """
+        children = {}
+        for child in self._node_children:
+            children.setdefault(child.name, child)
+        return children
+
+    def _compute_node_weights(self):
+        """
+        Builds the node weights of the Compare object, given the node weights of its children, by summing the node
+        weights of each child multiplied by the child's local weight. The node weights of each child are added
+        as a vector over an index of the elements of all of the children, in the order of the local weights,
+        which gives the same values and order as summing and sorting dictionaries of node weights.
+        If the Compare object is compact and its children share a single list of elements, the node weights are
+        kept in the order of that list and the '_node_weights' dictionary is only built when accessed.
+        """
+        children = self._get_children_by_name()
+        weighted_vectors = [(parent_value, children[parent_key]._get_node_vector())
+                            for parent_key, parent_value in self.local_weights.items() if parent_key in children]
+        first_elements = weighted_vectors[0][1][0] if weighted_vectors else None
+
+        if self.compact and all(elements is first_elements for _, (elements, _) in weighted_vectors):
+            node_vector = np.zeros(len(first_elements or ()))
+            for parent_value, (_, vector) in weighted_vectors:
+                node_vector += parent_value * vector
+            self._node_elements = first_elements or []
+            self._node_vector = node_vector.round(self._node_precision)
+            self._node_weights = None
+            return
+
+        # The index keeps the order in which the elements are first seen, so that ties are sorted as before
+        elements = list(dict.fromkeys(itertools.chain.from_iterable(vector[0] for _, vector in weighted_vectors)))
+        index = {element: position for position, element in enumerate(elements)}
+        positions = {}
+        node_vector = np.zeros(len(elements))
+        for parent_value, (child_elements, vector) in weighted_vectors:
+            if id(child_elements) not in positions:
+                positions[id(child_elements)] = np.fromiter(map(index.__getitem__, child_elements), int,
+                                                            len(child_elements))
+            node_vector[positions[id(child_elements)]] += parent_value * vector
+        order = np.argsort(-node_vector, kind='stable')
+        self._node_elements = [elements[position] for position in order]
+        self._node_vector = node_vector[order].round(self._node_precision)
+        self._node_weights = None if self.compact else dict(zip(self._node_elements, self._node_vector))
+
+    def _set_target_weights(self):
+        """
+        Removes the 'target_weights' property of all children, then resets the property of the current Compare object.
+        """
+        for child in self._node_children:
+            child._target_weights = None
+        self._target_weights = self._node_weights
+
+    def _compute_global_and_local_weights(self):
+        """
+        Recursively updates both the global and local weights of the Compare object's immediate descendants.
+        """
+        if self._node_children:
+            children = self._get_children_by_name()
+            for parent_key, parent_value in self.local_weights.items():
+                if parent_key in children:
+                    child = children[parent_key]
+                    child._global_weight = np.round(self._global_weight * parent_value, self.precision)
+                    child._local_weight = parent_value
+                    child._apply_weight()
+                    child._compute_global_and_local_weights()
+
+    def _apply_weight(self):
+        """
+        Updates the 'global_weights' dictionary of the Compare object, given the global weight of the node.
+        Compact Compare objects build their global weights when accessed, so there is nothing to update.
+        """
+        if self._global_weights is None:
+            return
+        for key in self._global_weights:
+            self._global_weights[key] = np.round(self._global_weight * self.local_weights[key], self.precision)
+
+    def update_comparison(self, key, value):
+        """
+        Updates a single input comparison of the Compare object; see 'update_comparisons()'.
+        :param key: tuple or string, either a tuple of two elements or a single element, matching the form
+            of the keys of the input 'comparisons' dictionary
+        :param value: float, the new comparison value
+        """
+        self.update_comparisons({key: value})
+
+    @_instrumented('update')
+    def update_comparisons(self, comparisons):
+        """
+        Updates one or more input comparisons of the Compare object in place, then recomputes its weights and
+        consistency ratio and propagates them through the hierarchy. The previous priority vector is used as the
+        starting point of the 'power' method and the previous values of any missing comparisons are used as the
+        starting point of the 'cyclic' completion algorithm. Only the weights of the Compare object's ancestors
+        and descendants are recomputed.
+        :param comparisons: dictionary, the new comparison values, in the same form as the input 'comparisons'
+            dictionary; the elements of each key must already be elements of the Compare object
+        """
+        self._check_input(comparisons)
+        for key in comparisons:
+            if any(element not in self._indices for element in (key if not self._normalize else (key,))):
+                msg = f'{key} is an invalid comparison. ' \
+                      f'The elements of each comparison must be elements of {self.name}.'
+                raise ValueError(msg)
+        if isinstance(self.comparisons, _ValueMapping):
+            self._update_values(comparisons)
+        else:
+            updated_comparisons = dict(self.comparisons)
+            if not self._normalize:
+                for key in comparisons:
+                    updated_comparisons.pop(key[::-1], None)
+            updated_comparisons.update(comparisons)
+            self.comparisons = updated_comparisons
+
+        previous_vector = self._priority_vector
+        previous_missing_comparisons = self._missing_comparisons
+        if self._normalize:
+            self._build_normalized_matrix()
+        else:
+            self._insert_comparisons()
+            self._build_matrix()
+        self._get_missing_comparisons()
+        if self._missing_comparisons:
+            for key in self._missing_comparisons.keys() & previous_missing_comparisons.keys():
+                self._missing_comparisons[key] = previous_missing_comparisons[key]
+            self._complete_matrix()
+        self._compute(previous_vector)
+        if self._get_root()._stale:
+            self._mark_stale()
+        else:
+            self._update_hierarchy()
+
+    def _update_values(self, comparisons):
+        """
+        Writes new values into the array backing a Compare object created by 'from_values()', so that updating
+        the Compare object does not convert its values into a dictionary. A read-only array, such as a numpy memmap
+        opened in read-only mode, is first copied into memory.
+        :param comparisons: dictionary, the new value of each updated element
+        """
+        values = self.comparisons.values
+        if not values.flags.writeable:
+            values = np.array(values)
+            self.comparisons = _ValueMapping(self.comparisons.element_index, values)
+        values[[self._indices[key] for key in comparisons]] = [float(value) for value in comparisons.values()]
+
+    @_instrumented('recompute')
+    def _update_hierarchy(self):
+        """
+        Updates the global weights of the Compare object and its descendants, then updates the node weights of its
+        ancestors and the target weights of the hierarchy, given new local weights of the Compare object.
+        """
+        self._apply_weight()
+        if self._node_children:
+            self._compute_node_weights()
+            self._compute_global_and_local_weights()
+        self._target_weights = self._node_weights if self._global_weight == 1.0 else None
+
+        node = self
+        while node._node_parent:
+            node = node._node_parent
+            node._compute_node_weights()
+        node._target_weights = node._node_weights
+
+    def _iter_hierarchy(self):
+        """
+        Yields the Compare object and all of its descendants, each parent before its children and the children
+        in the order they were added, without recursion.
+        """
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            yield node
+            nodes.extend(reversed(node._node_children or ()))
+
+    def _get_report_root(self):
+        """
+        Returns the Compare object from which a complete report starts, which is the first Compare object
+        with a global weight of 1.0 found when climbing the hierarchy.
+        """
+        node = self
+        while node._global_weight != 1.0:
+            node = node._node_parent
+        return node
+
+    def _build_report(self, verbose):
+        """
+        Returns a standard or verbose report for the Compare object alone as a dictionary.
+        :param verbose: boolean, whether to include full details of the Compare object within the report
+        """
+
+        def set_random_index():
+            """
+            Returns the full name of a valid random index as a string, else None.
+            """
+            random_index = None
+            if self.random_index == 'dd':
+                random_index = 'Donegan & Dodd'
+            elif self.random_index == 'saaty':
+                random_index = 'Saaty'
+            return random_index
+
+        report = {'name': self.name,
+                  'global_weight': self._global_weight,
+                  'local_weight': self._node_parent.local_weights[self.name] if self._global_weight != 1.0 else 1.0,
+                  'target_weights': self._get_node_weights() if self._global_weight == 1.0 else None,
+                  'elements': {
+                      'global_weights': self.global_weights,
+                      'local_weights': self.local_weights,
+                      'consistency_ratio': self.consistency_ratio
+                  }
+                  }
+        if verbose:
+            report['elements'].update({'random_index': set_random_index(),
+                                       'count': len(self._elements),
+                                       'names': self._elements})
+            report.update({'children': {
+                'count': len(self._node_children),
+                'names': [child.name for child in self._node_children]
+            } if self._node_children else None,
+                           'comparisons': {
+                               'count': len(self.comparisons) + len(self._missing_comparisons),
+                               'input': dict(self.comparisons),
+                               'computed': self._missing_comparisons if self._missing_comparisons else None
+                           }
+                           })
+        return report
+
+    def iter_report(self, complete=False, verbose=False):
+        """
+        Yields the key information of the Compare object as a dictionary or, if complete, that of every Compare object
+        in the hierarchy, one Compare object at a time and in the same order as the complete report, so that the
+        reports of a large hierarchy can be processed without holding all of them in memory; see 'report()'.
+        :param complete: boolean, whether to yield a report for every Compare object in the hierarchy; default is False
+        :param verbose: boolean, whether to include full details of the Compare object within the report;
+            default is False
+        """
+        self._refresh()
+        if not complete:
+            yield self._build_report(verbose)
+            return
+        for node in self._get_report_root()._iter_hierarchy():
+            yield node._build_report(verbose)
+
+    def write_report(self, file, complete=False, verbose=False, ndjson=False, indent=None):
+        """
+        Writes the key information of the Compare object to a file as JSON, building and writing the report of one
+        Compare object at a time rather than the whole report at once. With the default arguments, the output is
+        the same as that printed by 'report(show=True)', given an indent of 4.
+        :param file: file, a file-like object opened for writing text, such as an open file or sys.stdout
+        :param complete: boolean, whether to write a report for every Compare object in the hierarchy;
+            default is False
+        :param verbose: boolean, whether to include full details of the Compare object within the report;
+            default is False
+        :param ndjson: boolean, whether to write newline-delimited JSON, with the report of each Compare object
+            on its own line, rather than a single JSON object; default is False
+        :param indent: integer, the number of spaces by which to indent nested JSON objects; if None, each JSON object
+            is written on a single line; ignored if 'ndjson' is True; default is None
+        """
+        _write_json_reports(file, self.iter_report(complete, verbose), complete, ndjson, indent)
+
+    def report(self, complete=False, show=False, verbose=False):
+        """
+        Returns the key information of the Compare object as a dictionary, optionally prints to the console.
+        :param complete: boolean, whether to return a report for every Compare object in the hierarchy; default is False
+        :param show: boolean, whether to print the report to the console; default is False
+        :param verbose: boolean, whether to include full details of the Compare object within the report; default is False
+        """
+        if complete:
+            hierarchy = {report['name']: report for report in self.iter_report(complete, verbose)}
+        else:
+            hierarchy = next(self.iter_report(complete, verbose))
+
+        if show:
+            _write_json_reports(sys.stdout, hierarchy.values() if complete else [hierarchy], complete, indent=4)
+            print()
+
+        return hierarchy
+
+    def to_columns(self):
+        """
+        Returns the weights, consistency ratios and computed comparisons of every Compare object in the hierarchy
+        as columns of numpy arrays, with the names of the Compare objects and their elements dictionary-encoded;
+        see 'ReportColumns'.
+        """
+        columns = ReportColumns()
+        columns.append(self)
+        return columns
+
+    def save(self, path):
+        """
+        Saves the Compare object and its descendants to a NumPy '.npz' file, including their completed matrices,
+        weights and consistency ratios, so that they can be loaded without being recomputed; see 'load()'.
+        :param path: string or file, the file to which to save; '.npz' is appended to a path that lacks it
+        """
+        _save_nodes(path, [self])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns the Compare object saved to the input file by 'save()', with its descendants as its children.
+        No missing comparisons, priority vectors or consistency ratios are recomputed; only the weights of the
+        hierarchy are synthesized again. The loaded Compare object is at the top of its hierarchy.
+        :param path: string or file, the file from which to load
+        """
+        return _load_nodes(path)[0][0]
+
+    def _get_state(self, codes, alternatives):
+        """
+        Returns the parameters and results of the Compare object as a dictionary that can be converted to JSON,
+        along with a dictionary of its numpy arrays, in which its input comparisons are stored as the codes
+        of their elements and their values; see '_from_state()'. A Compare object created by 'from_values()'
+        stores only its values array, along with the number of its shared index of alternatives.
+        :param codes: dictionary, the code of each element saved so far, to which any new elements are added
+        :param alternatives: dictionary, the number and the shared index of alternatives of each index saved so far,
+            keyed by the id of the index, to which the index of the Compare object is added if it is new
+        """
+        state = {parameter: getattr(self, parameter) for parameter in _SAVED_PARAMETERS}
+        state['class'] = type(self).__name__
+        state['lambda_max'] = self._lambda_max
+        state['consistency_ratio'] = self.consistency_ratio
+        arrays = {'priority_vector': self._priority_vector,
+                  'missing_comparisons': np.fromiter(self._missing_comparisons.values(), float,
+                                                     len(self._missing_comparisons))}
+        if isinstance(self.comparisons, _ValueMapping):
+            element_index = self.comparisons.element_index
+            state['alternatives'] = alternatives.setdefault(id(element_index), (len(alternatives), element_index))[0]
+            arrays['values'] = self.comparisons.values
+            return state, arrays
+        keys = list(self.comparisons)
+        arrays['comparison_keys'] = _encode_keys(keys, codes)
+        arrays['comparison_values'] = np.fromiter(self.comparisons.values(), float, len(keys))
+        arrays['matrix'] = self._matrix
+        return state, arrays
+
+    @classmethod
+    def _from_state(cls, state, arrays, elements, alternatives):
+        """
+        Returns a Compare object restored from the output of '_get_state()', without computing its results.
+        A Compare object created by 'from_values()' is restored with its values array and shared index of alternatives.
+        :param state: dictionary, the parameters and results of the Compare object
+        :param arrays: dictionary, the numpy arrays of the Compare object
+        :param elements: list, the saved elements, in the order of their codes
+        :param alternatives: dictionary, the shared index of alternatives of each saved index, keyed by its number
+        """
+        node = cls.__new__(cls)
+        for parameter in _SAVED_PARAMETERS:
+            setattr(node, parameter, state[parameter])
+        node.warm_start = None
+        if state.get('alternatives') is not None:
+            node.comparisons = _ValueMapping(alternatives[state['alternatives']], arrays['values'])
+        else:
+            node.comparisons = dict(zip(_decode_keys(arrays['comparison_keys'], elements),
+                                        arrays['comparison_values'].tolist()))
+        node._setup()
+        node._restore_results({'matrix': arrays.get('matrix'),
+                               'missing_comparisons': arrays['missing_comparisons'],
+                               'priority_vector': arrays['priority_vector'], 'lambda_max': state['lambda_max'],
+                               'consistency_ratio': state['consistency_ratio']})
+        node._target_weights = node._node_weights
+        return node
+
+
+# The number of respondents of a GroupCompare object whose priority vectors are computed together, and the precision
+# of those priority vectors, which are barely rounded so that no element of them is rounded to zero
+_AIP_CHUNK_SIZE = 1024
+_AIP_PRECISION = 15
+
+
+class GroupCompare(Compare):
+    """
+    This class aggregates the comparisons of many respondents who compare the same elements, consuming them
+    one respondent at a time so that its memory use does not depend on the number of respondents.
+    Each aggregated comparison is the geometric mean of the values given by the respondents who made that comparison
+    (the aggregation of individual judgments); comparisons made by no respondent are computed as missing comparisons.
+    The weights and consistency ratio of the aggregated comparisons are those of a Compare object, so a GroupCompare
+    object can be used anywhere a Compare object can, including as a node of a hierarchy.
+    The normalized geometric mean of the priority vectors of the respondents (the aggregation of individual
+    priorities) is also computed, unless 'aip' is False.
+    :param name: string, the name of the GroupCompare object;
+        if the object has a parent, this name MUST be included as an element of its parent
+    :param respondents: iterable, such as a list or a generator, of the comparisons of each respondent,
+        each a dictionary in either of the forms accepted by the Compare class
+    :param aip: boolean, whether to aggregate the priority vectors of the respondents, which requires computing
+        the priority vector of each respondent; default is True
+    All other parameters are identical to those of the Compare class.
+    """
+    __slots__ = ('respondent_count', 'aip', 'aggregated_priorities', '_log_sums', '_counts', '_log_priorities')
+
+    def __init__(self, name, respondents, precision=4, random_index='dd', iterations=100, tolerance=0.0001, cr=True,
+                 method='squaring', completion='cyclic', compact=False, aip=True):
+        self.respondent_count = 0
+        self.aip = aip
+        self.aggregated_priorities = None
+        self._log_sums = {}
+        self._counts = {}
+        self._log_priorities = {}
+
+        # The priority vectors of the respondents are computed as they are consumed, before the aggregated
+        # comparisons exist, so the parameters they share with the GroupCompare object are set first
+        self.name = name
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.method = method.lower()
+        self.completion = completion.lower()
+        # The methods are checked before any respondent is consumed, since a generator cannot be consumed again
+        _check_method(self.method)
+        _check_method(self.completion, COMPLETION_METHODS)
+        self._add_respondents(respondents)
+        if not self.respondent_count:
+            msg = f'{name} must have at least one respondent.'
+            raise ValueError(msg)
+
+        super().__init__(name, self._get_aggregated_comparisons(), precision, random_index, iterations, tolerance,
+                         cr, self.method, self.completion, compact)
+        self._set_aggregated_priorities()
+
+    def update(self, respondents):
+        """
+        Adds the comparisons of more respondents to the GroupCompare object, then recomputes its aggregated weights
+        and consistency ratio and propagates them through the hierarchy; see 'Compare.update_comparisons()'.
+        The respondents may only compare elements of the GroupCompare object.
+        :param respondents: iterable, such as a list or a generator, of the comparisons of each respondent
+        """
+        self._add_respondents(respondents)
+        super().update_comparisons(self._get_aggregated_comparisons())
+        self._set_aggregated_priorities()
+
+    def update_comparisons(self, comparisons):
+        """
+        Raises a TypeError, since the comparisons of a GroupCompare object are aggregated from its respondents
+        and any direct change to them would be overwritten when respondents are added; see 'update()'.
+        :param comparisons: dictionary, the new comparison values
+        """
+        msg = f'The comparisons of {self.name} are aggregated from its respondents and cannot be updated directly. ' \
+              'Use update() to add respondents instead.'
+        raise TypeError(msg)
+
+    def _add_respondents(self, respondents):
         """
-        Sets the '_node_precision' property of the Compare object by selecting the lowest precision of its children.
+        Adds the logarithms of the comparisons of each respondent to the running sums of the GroupCompare object.
+        Raises a ValueError if a respondent makes no comparisons or compares an element that is not an element
+        of the existing GroupCompare object, in which case none of the input respondents are added.
+        :param respondents: iterable, the comparisons of each respondent
         """
-        lowest_precision = np.min([child._node_precision for child in self._node_children])
-        if lowest_precision < self.precision:
-            self._node_precision = lowest_precision
-        else:
-            self._node_precision = self.precision
+        log_sums, counts, log_priorities = dict(self._log_sums), dict(self._counts), dict(self._log_priorities)
+        count = self.respondent_count
+        elements = self._indices if self.respondent_count else None
+        # The priority vectors of the respondents are computed together, a chunk of respondents at a time
+        matrices, vectors = [], []
+        for comparisons in respondents:
+            if not comparisons:
+                msg = f'Each respondent of {self.name} must make at least one comparison.'
+                raise ValueError(msg)
+            self._check_input(comparisons)
+            for key, value in comparisons.items():
+                if elements is not None and any(element not in elements
+                                                for element in (key if isinstance(key, tuple) else (key,))):
+                    msg = f'{key} is an invalid comparison. The elements of each comparison must be elements of ' \
+                          f'{self.name}.'
+                    raise ValueError(msg)
+                log_value = np.log(float(value))
+                # Each comparison is summed in the orientation in which it was first made
+                if isinstance(key, tuple) and key[::-1] in log_sums:
+                    key, log_value = key[::-1], -log_value
+                log_sums[key] = log_sums.get(key, 0.0) + log_value
+                counts[key] = counts.get(key, 0) + 1
+            if self.aip:
+                self._add_respondent_matrix(comparisons, log_priorities, matrices, vectors)
+                if len(matrices) + len(vectors) == _AIP_CHUNK_SIZE:
+                    self._add_priorities(matrices, vectors, log_priorities)
+            count += 1
+        if self.aip:
+            self._add_priorities(matrices, vectors, log_priorities)
+        self._log_sums, self._counts, self._log_priorities = log_sums, counts, log_priorities
+        self.respondent_count = count
 
-    def _compute_node_weights(self):
+    def _add_respondent_matrix(self, comparisons, log_priorities, matrices, vectors):
         """
-        Builds the '_node_weights' dictionary of the Compare object, given the target weights of its children.
-        """
-        self._node_weights = dict()
-        for parent_key, parent_value in self.local_weights.items():
-            for child in self._node_children:
-                if parent_key == child.name:
-                    for child_key, child_value in child._node_weights.items():
-                        value = parent_value * child_value
-                        try:
-                            self._node_weights[child_key] += value
-                        except KeyError:
-                            self._node_weights[child_key] = value
-                    break
-        self._node_weights = dict(sorted(self._node_weights.items(), key=lambda item: item[1], reverse=True))
-        self._node_weights = {key: value.round(self._node_precision) for key, value in self._node_weights.items()}
+        Adds the completed comparison matrix of a respondent, or the normalized values of a respondent who compares
+        measured values, to those whose priority vectors are still to be computed, ordering the elements as the
+        running sums do. The elements of the first respondent set that order.
+        Raises a ValueError if the respondent does not compare the same elements as the other respondents.
+        :param comparisons: dictionary, the comparisons of the respondent
+        :param log_priorities: dictionary, the running sums of the logarithms of the priority vectors, keyed by element
+        :param matrices: list, the matrices of the respondents whose priority vectors are still to be computed
+        :param vectors: list, the normalized values of the respondents whose priority vectors are still to be computed
+        """
+        normalize = not isinstance(next(iter(comparisons)), tuple)
+        respondent_elements = comparisons.keys() if normalize else set(itertools.chain.from_iterable(comparisons))
+        if not log_priorities:
+            log_priorities.update(dict.fromkeys(comparisons if normalize else
+                                                dict.fromkeys(itertools.chain.from_iterable(comparisons)), 0.0))
+        elif log_priorities.keys() != respondent_elements:
+            msg = f'To aggregate individual priorities, every respondent of {self.name} must compare ' \
+                  'the same elements.'
+            raise ValueError(msg)
+        if normalize:
+            values = np.array([float(comparisons[element]) for element in log_priorities])
+            vectors.append(values / values.sum())
+            return
 
-    def _set_target_weights(self):
+        indices = {element: index for index, element in enumerate(log_priorities)}
+        size = len(indices)
+        rows, columns, values = _comparison_locations(comparisons, indices)
+        matrix = np.ones((size, size))
+        matrix[rows, columns] = values
+        matrix[columns, rows] = np.reciprocal(values)
+        if len(values) < size * (size - 1) // 2:
+            matrix = self._complete_respondent_matrix(comparisons, list(log_priorities))
+        matrices.append(matrix)
+
+    def _complete_respondent_matrix(self, comparisons, elements):
         """
-        Removes the 'target_weights' property of all children, then resets the property of the current Compare object.
+        Returns the comparison matrix of a respondent who did not make every comparison, with its missing comparisons
+        computed by the completion algorithm of the GroupCompare object. The matrix is completed by a bare Compare
+        object, which neither counts as a new Compare object nor uses the result cache.
+        :param comparisons: dictionary, the comparisons of the respondent
+        :param elements: list, the elements in the order of the rows of the returned matrix
         """
-        for child in self._node_children:
-            child.target_weights = None
-        self.target_weights = self._node_weights
+        individual = Compare.__new__(Compare)
+        individual.name = self.name
+        individual.comparisons = comparisons
+        individual.precision = _AIP_PRECISION
+        individual.random_index = None
+        individual.iterations = self.iterations
+        individual.tolerance = self.tolerance
+        individual.cr = False
+        individual.method = self.method
+        individual.completion = self.completion
+        individual.compact = False
+        individual.warm_start = None
+        individual._setup()
+        individual._complete_matrix()
+        order = [individual._indices[element] for element in elements]
+        return individual._matrix[np.ix_(order, order)]
 
-    def _compute_global_and_local_weights(self):
+    def _add_priorities(self, matrices, vectors, log_priorities):
         """
-        Recursively updates both the global and local weights of the Compare object's immediate descendants.
+        Computes the priority vectors of the pending respondents together and adds their logarithms to the running
+        sums of the GroupCompare object, then empties the pending lists.
+        :param matrices: list, the matrices of the respondents whose priority vectors are still to be computed
+        :param vectors: list, the normalized values of the respondents whose priority vectors are still to be computed
+        :param log_priorities: dictionary, the running sums of the logarithms of the priority vectors, keyed by element
         """
-        if self._node_children:
-            for parent_key, parent_value in self.local_weights.items():
-                for child in self._node_children:
-                    if parent_key == child.name:
-                        child.global_weight = np.round(self.global_weight * parent_value, self.precision)
-                        child.local_weight = parent_value
-                        child._apply_weight()
-                        child._compute_global_and_local_weights()
-                        break
+        if matrices:
+            priority_vectors, _ = _compute_priority_vectors(np.stack(matrices), self.method, self.iterations,
+                                                            _AIP_PRECISION)
+            vectors.extend(priority_vectors)
+        if vectors:
+            log_sums = np.log(np.array(vectors)).sum(axis=0)
+            for element, log_sum in zip(log_priorities, log_sums):
+                log_priorities[element] += log_sum
+        matrices.clear()
+        vectors.clear()
 
-    def _apply_weight(self):
+    def _get_aggregated_comparisons(self):
         """
-        Updates the 'global_weights' dictionary of the Compare object, given the global weight of the node.
+        Returns the geometric mean of the values of each comparison made by the respondents.
         """
-        for key in self.global_weights:
-            self.global_weights[key] = np.round(self.global_weight * self.local_weights[key], self.precision)
+        return {key: float(np.exp(log_sum / self._counts[key])) for key, log_sum in self._log_sums.items()}
 
-    def _get_report(self, params):
+    def _set_aggregated_priorities(self):
         """
-        Climbs to the top of the hierarchy, then calls '_build_report()'.
-        :param params: tuple, a nested dictionary containing reports and a boolean for the verbose argument
+        Sets the 'aggregated_priorities' property of the GroupCompare object to the normalized geometric mean
+        of the priority vectors of the respondents.
         """
-        if self.global_weight != 1.0:
-            self._node_parent._get_report(params)
-        else:
-            return self._build_report(params)
+        if not self.aip:
+            return
+        log_means = np.array([self._log_priorities[element] for element in self._elements]) / self.respondent_count
+        priorities = np.exp(log_means - np.max(log_means))
+        priorities = (priorities / np.sum(priorities)).round(self.precision)
+        weights = dict(zip(self._elements, priorities))
+        self.aggregated_priorities = dict(sorted(weights.items(), key=lambda item: item[1], reverse=True))
 
-    def _build_report(self, params):
+    def _get_state(self, codes, alternatives):
         """
-        Creates a standard or verbose report for the Compare object, then calls itself on all of the object's children.
-        :param params: tuple, a nested dictionary containing reports and a boolean for the verbose argument
+        Returns the parameters and results of the GroupCompare object, including the running sums of its
+        respondents, as a dictionary that can be converted to JSON, along with a dictionary of its numpy arrays.
         """
+        state, arrays = super()._get_state(codes, alternatives)
+        state['respondents'] = self.respondent_count
+        state['aip'] = self.aip
+        arrays['log_sum_keys'] = _encode_keys(list(self._log_sums), codes)
+        arrays['log_sums'] = np.fromiter(self._log_sums.values(), float, len(self._log_sums))
+        arrays['counts'] = np.fromiter(self._counts.values(), np.int64, len(self._counts))
+        arrays['log_priority_keys'] = _encode_keys(list(self._log_priorities), codes)
+        arrays['log_priorities'] = np.fromiter(self._log_priorities.values(), float, len(self._log_priorities))
+        return state, arrays
 
-        def set_random_index():
-            """
-            Returns the full name of a valid random index as a string, else None.
-            """
-            random_index = None
-            if self.random_index == 'dd':
-                random_index = 'Donegan & Dodd'
-            elif self.random_index == 'saaty':
-                random_index = 'Saaty'
-            return random_index
+    @classmethod
+    def _from_state(cls, state, arrays, elements, alternatives):
+        """
+        Returns a GroupCompare object restored from the output of '_get_state()', without computing its results.
+        """
+        node = super()._from_state(state, arrays, elements, alternatives)
+        node.respondent_count = state['respondents']
+        node.aip = state['aip']
+        keys = _decode_keys(arrays['log_sum_keys'], elements)
+        node._log_sums = dict(zip(keys, arrays['log_sums'].tolist()))
+        node._counts = dict(zip(keys, arrays['counts'].tolist()))
+        node._log_priorities = dict(zip(_decode_keys(arrays['log_priority_keys'], elements),
+                                        arrays['log_priorities'].tolist()))
+        node.aggregated_priorities = None
+        node._set_aggregated_priorities()
+        return node
 
-        hierarchy, verbose = params
-
-        hierarchy[self.name] = {'name': self.name,
-                                'global_weight': self.global_weight,
-                                'local_weight': self._node_parent.local_weights[
-                                    self.name] if self.global_weight != 1.0 else 1.0,
-                                'target_weights': self._node_weights if self.global_weight == 1.0 else None,
-                                'elements': {
-                                    'global_weights': self.global_weights,
-                                    'local_weights': self.local_weights,
-                                    'consistency_ratio': self.consistency_ratio
-                                }
-                                }
-        if verbose:
-            hierarchy[self.name]['elements'].update({'random_index': set_random_index(),
-                                                     'count': len(self._elements),
-                                                     'names': self._elements})
-            hierarchy[self.name].update({'children': {
-                'count': len(self._node_children),
-                'names': [child.name for child in self._node_children]
-            } if self._node_children else None,
-                                         'comparisons': {
-                                             'count': len(self.comparisons) + len(self._missing_comparisons),
-                                             'input': self.comparisons,
-                                             'computed': self._missing_comparisons if self._missing_comparisons else None
-                                         }
-                                         })
-        if self._node_children:
-            for child in self._node_children:
-                child._build_report(params)
 
-        return hierarchy
+# The parameters of a Compare object saved by 'Compare.save()' and 'Compose.save()', and the version of the format
+_SAVED_PARAMETERS = ('name', 'precision', 'random_index', 'iterations', 'tolerance', 'cr', 'method', 'completion',
+                     'compact')
+_SAVE_FORMAT = 2
 
-    def report(self, complete=False, show=False, verbose=False):
-        """
-        Returns the key information of the Compare object as a dictionary, optionally prints to the console.
-        :param complete: boolean, whether to return a report for every Compare object in the hierarchy; default is False
-        :param show: boolean, whether to print the report to the console; default is False
-        :param verbose: boolean, whether to include full details of the Compare object within the report; default is False
-        """
 
-        def convert_keys_to_json_format(input_dict):
-            """
-            Returns a dictionary with keys in JSON format.
-            :param input_dict: dictionary, the dictionary to be converted
-            """
-            try:
-                comparisons = {}
-                if not self._normalize:
-                    for key, value in input_dict.items():
-                        comparisons[', '.join(key)] = value
-                else:
-                    raise AttributeError
-            except AttributeError:
-                comparisons = input_dict
-            return comparisons
+def _encode_keys(keys, codes):
+    """
+    Returns the comparison keys as a numpy array of the codes of their elements, of shape (m, 2) if each key is a tuple
+    of two elements or of shape (m,) if each key is a single element, adding any new elements to the codes.
+    :param keys: list, the comparison keys
+    :param codes: dictionary, the code of each element saved so far
+    """
+    pairwise = bool(keys) and isinstance(keys[0], tuple)
+    elements = itertools.chain.from_iterable(keys) if pairwise else keys
+    encoded = np.fromiter((codes.setdefault(element, len(codes)) for element in elements), np.int64)
+    return encoded.reshape(-1, 2) if pairwise else encoded
 
-        hierarchy = {}
-        self._get_report((hierarchy, verbose))
-        if not complete:
-            hierarchy = dict({'name': self.name}, **hierarchy[self.name])
 
-        if show:
-            json_report = copy.deepcopy(hierarchy)
-            if verbose:
-                for comparison in ('input', 'computed'):
-                    if complete:
-                        for key in json_report.keys():
-                            json_report[key]['comparisons'][comparison] = convert_keys_to_json_format(
-                                json_report[key]['comparisons'][comparison])
-                    else:
-                        json_report['comparisons'][comparison] = convert_keys_to_json_format(
-                            json_report['comparisons'][comparison])
-            print(json.dumps(json_report, indent=4))
+def _decode_keys(encoded, elements):
+    """
+    Returns the list of comparison keys encoded by '_encode_keys()'.
+    :param encoded: numpy array, the codes of the elements of the comparison keys
+    :param elements: list, the saved elements, in the order of their codes
+    """
+    if encoded.ndim == 2:
+        return [(elements[first], elements[second]) for first, second in encoded.tolist()]
+    return [elements[code] for code in encoded.tolist()]
 
-        return hierarchy
+
+def _json_default(value):
+    """
+    Returns a numpy number, or any other number that cannot be converted to JSON, as a Python number.
+    """
+    return value.item() if isinstance(value, np.generic) else float(value)
+
+
+def _get_json_report(report):
+    """
+    Returns a report of a Compare object in a form that can be converted to JSON, joining the elements
+    of each pairwise comparison into a single string. Only the dictionaries that change are copied.
+    :param report: dictionary, the report of a Compare object
+    """
+    if report.get('comparisons') is None:
+        return report
+    comparisons = dict(report['comparisons'])
+    for kind in ('input', 'computed'):
+        if comparisons[kind] is not None:
+            comparisons[kind] = {', '.join(key) if isinstance(key, tuple) else key: value
+                                 for key, value in comparisons[kind].items()}
+    return dict(report, comparisons=comparisons)
+
+
+def _write_json_reports(file, reports, complete, ndjson=False, indent=None):
+    """
+    Writes reports of Compare objects to a file as JSON, one report at a time. A complete report is written
+    as a single JSON object keyed by the name of each Compare object, identical to converting the whole report
+    at once, and a report of a single Compare object as that report alone.
+    :param file: file, a file-like object opened for writing text
+    :param reports: iterable, the reports of the Compare objects
+    :param complete: boolean, whether the reports form a complete report
+    :param ndjson: boolean, whether to write each report on its own line; default is False
+    :param indent: integer, the number of spaces by which to indent nested JSON objects; default is None
+    """
+    if ndjson:
+        for report in reports:
+            file.write(json.dumps(_get_json_report(report), default=_json_default))
+            file.write('\n')
+        return
+    if not complete:
+        for report in reports:
+            file.write(json.dumps(_get_json_report(report), indent=indent, default=_json_default))
+        return
+    # Each report is nested one level deeper than when converted alone, so each of its lines is indented once more
+    margin = ' ' * indent if indent is not None else ''
+    separator = ',\n' if indent is not None else ', '
+    file.write('{\n' if indent is not None else '{')
+    for number, report in enumerate(reports):
+        text = json.dumps(_get_json_report(report), indent=indent, default=_json_default)
+        file.write(f'{separator if number else ""}{margin}{json.dumps(report["name"])}: '
+                   f'{text.replace(chr(10), chr(10) + margin)}')
+    file.write('\n}' if indent is not None else '}')
+
+
+def _save_nodes(path, nodes, metadata=None):
+    """
+    Saves the input Compare objects and all of their descendants to a NumPy '.npz' file. The parameters, results
+    and links between the Compare objects are stored as UTF-8 encoded JSON, along with the name of each element
+    once, and their input comparisons, matrices and priority vectors as arrays. Each index of alternatives shared
+    by Compare objects created by 'Compare.from_values()' is stored once.
+    :param path: string or file, the file to which to save
+    :param nodes: list, the Compare objects to save
+    :param metadata: dictionary, any other information to save; default is None
+    """
+    nodes = list(nodes)
+    indices = {id(node): index for index, node in enumerate(nodes)}
+    # Appending to the list while iterating over it visits the descendants of every Compare object
+    for node in nodes:
+        for child in node._node_children or ():
+            if id(child) not in indices:
+                indices[id(child)] = len(nodes)
+                nodes.append(child)
+
+    states = []
+    arrays = {}
+    codes = {}
+    alternatives = {}
+    for index, node in enumerate(nodes):
+        state, node_arrays = node._get_state(codes, alternatives)
+        state['parent'] = indices.get(id(node._node_parent)) if node._node_parent is not None else None
+        state['children'] = [indices[id(child)] for child in node._node_children] \
+            if node._node_children is not None else None
+        states.append(state)
+        arrays.update({f'{index}/{name}': array for name, array in node_arrays.items()})
+    for number, element_index in alternatives.values():
+        arrays[f'alternatives/{number}'] = _encode_keys(element_index.elements, codes)
+    metadata = {**(metadata or {}), 'format': _SAVE_FORMAT, 'elements': list(codes), 'nodes': states}
+    text = json.dumps(metadata, default=_json_default).encode()
+    np.savez(path, metadata=np.frombuffer(text, np.uint8), **arrays)
+
+
+def _load_nodes(path):
+    """
+    Returns the list of Compare objects saved to the input file by '_save_nodes()', linked to their parents
+    and children, along with the saved metadata. The weights of each hierarchy are synthesized again,
+    but no Compare object is recomputed.
+    :param path: string or file, the file from which to load
+    """
+    # numpy appends '.npz' to paths that lack it when saving
+    if isinstance(path, (str, os.PathLike)) and not os.path.exists(path) and os.path.exists(f'{path}.npz'):
+        path = f'{path}.npz'
+    with np.load(path, allow_pickle=False) as file:
+        metadata = file['metadata']
+        metadata = json.loads(metadata.tobytes().decode() if metadata.dtype == np.uint8 else metadata.item())
+        if metadata.get('format') != _SAVE_FORMAT:
+            msg = f"{path} was saved in an unsupported format."
+            raise ValueError(msg)
+        arrays = [{} for _ in metadata['nodes']]
+        alternatives = {}
+        for name in file.files:
+            index, _, array_name = name.partition('/')
+            if index.isdigit():
+                arrays[int(index)][array_name] = file[name]
+            elif index == 'alternatives':
+                alternatives[int(array_name)] = _get_element_index(_decode_keys(file[name], metadata['elements']))
+        classes = {'Compare': Compare, 'GroupCompare': GroupCompare}
+        nodes = [classes[state['class']]._from_state(state, node_arrays, metadata['elements'], alternatives)
+                 for state, node_arrays in zip(metadata['nodes'], arrays)]
+
+    for node, state in zip(nodes, metadata['nodes']):
+        if state['children'] is not None:
+            node._node_children = [nodes[index] for index in state['children']]
+            for child in node._node_children:
+                child._node_parent = node
+    for node, state in zip(nodes, metadata['nodes']):
+        if state['parent'] is None and node._node_children:
+            node._recompute_hierarchy()
+    return nodes, metadata
+
+
+def _build_compare(arguments):
+    """
+    Returns a Compare object created from the input arguments.
+    Defined at the module level so that it can be sent to the processes of a process pool.
+    :param arguments: list or tuple, the inputs necessary to create a Compare object
+    """
+    return Compare(*arguments)
 
 
 class Compose:
@@ -517,27 +2478,69 @@ class Compose:
     """
 
     def __init__(self):
-        self.nodes = []
+        self._nodes = []
+        self._registry = {}
         self.hierarchy = None
 
     def __getitem__(self, item):
         return self._get_node(item)
 
     def __getattr__(self, item):
+        # Private and special names are never looked up as nodes, so that copying and pickling work as expected
+        if item.startswith('_'):
+            raise AttributeError(item)
         return self._get_node(item)
 
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, value):
+        self._nodes = list(value)
+        self._build_registry()
+
+    def _build_registry(self):
+        """
+        Rebuilds the dictionary mapping the name of each stored Compare object to the Compare object,
+        keeping the first Compare object of any name that is shared by several Compare objects.
+        """
+        self._registry = {}
+        for node in self._nodes:
+            self._registry.setdefault(node.name, node)
+
+    def _add_node(self, node):
+        """
+        Adds a Compare object to the stored list of nodes and to the registry of their names.
+        :param node: Compare object, the Compare object to add
+        """
+        self._nodes.append(node)
+        self._registry.setdefault(node.name, node)
+
     def _get_node(self, name):
         """
-        Returns the named Compare object.
+        Returns the named Compare object, or None if there is none.
+        The registry is rebuilt if the name is not found, in case the list of nodes has been changed directly.
         :param name: string, the name of the desired Compare object
         """
-        for node in self.nodes:
-            if node.name == name:
-                return node
-        return None
+        node = self._registry.get(name)
+        if node is None:
+            self._build_registry()
+            node = self._registry.get(name)
+        return node
+
+    def _get_top_node(self):
+        """
+        Returns the Compare object at the top of the hierarchy.
+        Raises a ValueError if no hierarchy has been added.
+        """
+        if self.hierarchy is None:
+            msg = 'add_hierarchy() must be called before reporting on the hierarchy.'
+            raise ValueError(msg)
+        return self._get_node(list(self.hierarchy.keys())[0])
 
-    def add_comparisons(self, item,
-                        comparisons=None, precision=4, random_index='dd', iterations=100, tolerance=0.0001, cr=True):
+    def add_comparisons(self, item, comparisons=None, precision=4, random_index='dd', iterations=100, tolerance=0.0001,
+                        cr=True, method='squaring', completion='cyclic', compact=False, warm_start=None, workers=None):
         """
         Adds Compare objects to a stored list of nodes. Input can be either one or more Compare objects,
         one or more lists or tuples containing the inputs necessary to create a Compare object,
@@ -561,36 +2564,150 @@ class Compose:
             '_complete_matrix()'; the algorithm stops when the difference between the norms of two cycles
              of coordinates is less than this value; default is 0.0001
         :param cr: boolean, whether to compute the priority vector's consistency ratio; default is True
+        :param method: string, the method used to compute the priority vector;
+            see 'Compare._compute_priority_vector()' for more information regarding the different methods;
+            valid input: 'squaring', 'power', 'eigen', 'geometric'; default is 'squaring'
+        :param completion: string, the algorithm used to compute optimal values for missing comparisons;
+            see 'Compare._complete_matrix()' for more information regarding the different algorithms;
+            valid input: 'cyclic', 'llsm', 'newton'; default is 'cyclic'
+        :param compact: boolean, whether to reduce the memory used by the Compare object; default is False
+        :param warm_start: dictionary, Compare object or string, the initial values of the missing comparisons;
+            see the Compare class for more information; default is None
+        :param workers: integer, the number of processes across which to spread the creation of new Compare objects;
+            if None, they are created in the current process; default is None
+        """
+        nodes = self._collect_nodes(item, (comparisons, precision, random_index, iterations, tolerance, cr, method,
+                                           completion, compact, warm_start))
+        for node in self._build_nodes(nodes, workers):
+            self._add_node(node)
+
+    async def aadd_comparisons(self, item, comparisons=None, precision=4, random_index='dd', iterations=100,
+                               tolerance=0.0001, cr=True, method='squaring', completion='cyclic', compact=False,
+                               warm_start=None, executor=None):
         """
+        Adds Compare objects to a stored list of nodes, creating any new Compare objects concurrently in an executor
+        so that computing them does not block the running event loop. Takes the same input as 'add_comparisons()'.
+        Example: await compose.aadd_comparisons([drinks, ('Food', food_comparisons)], executor=pool)
+        :param executor: concurrent.futures.Executor, the executor in which to create new Compare objects,
+            such as a ThreadPoolExecutor or a ProcessPoolExecutor; if None, the default executor
+            of the event loop is used; default is None
+        """
+        nodes = self._collect_nodes(item, (comparisons, precision, random_index, iterations, tolerance, cr, method,
+                                           completion, compact, warm_start))
+        arguments = [node for node in nodes if not isinstance(node, Compare)]
+        loop = asyncio.get_running_loop()
+        built = await asyncio.gather(*(loop.run_in_executor(executor, _build_compare, argument)
+                                       for argument in arguments))
+        for node in self._merge_nodes(nodes, built):
+            self._add_node(node)
+
+    @staticmethod
+    def _collect_nodes(item, arguments):
+        """
+        Returns a list containing the input Compare objects and the lists or tuples of the inputs necessary
+        to create new Compare objects; see 'add_comparisons()'.
+        :param item: Compare object, list or tuple, string, the 'item' argument of 'add_comparisons()'
+        :param arguments: tuple, the remaining arguments necessary to create a new Compare object
+            if 'item' is its name
+        """
+        nodes = []
         if isinstance(item, Compare):
-            self.nodes.append(item)
+            nodes.append(item)
         elif isinstance(item, (list, tuple)):
             for i in item:
                 if isinstance(i, Compare):
-                    self.nodes.append(i)
+                    nodes.append(i)
                 elif isinstance(i, str):
-                    self.nodes.append(Compare(*item))
+                    nodes.append(item)
                     break
                 else:
-                    self.nodes.append(Compare(*i))
+                    nodes.append(i)
         else:  # item is a Compare object name
-            self.nodes.append(Compare(item, comparisons, precision, random_index, iterations, tolerance, cr))
+            nodes.append((item,) + arguments)
+        return nodes
+
+    @staticmethod
+    def _build_nodes(nodes, workers):
+        """
+        Returns a list of Compare objects, creating a new Compare object from each list or tuple of inputs.
+        New Compare objects are independent of each other until they are added to a hierarchy,
+        so they can be created in parallel.
+        :param nodes: list, containing Compare objects and lists or tuples of the inputs necessary to create them
+        :param workers: integer, the number of processes across which to spread the creation of new Compare objects;
+            if None, they are created in the current process
+        """
+        arguments = [node for node in nodes if not isinstance(node, Compare)]
+        if workers is None or len(arguments) < 2:
+            built = list(map(_build_compare, arguments))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                built = list(executor.map(_build_compare, arguments))
+        return Compose._merge_nodes(nodes, built)
 
-    def add_hierarchy(self, hierarchy):
+    @staticmethod
+    def _merge_nodes(nodes, built):
         """
-        Builds a hierarchy of the stored Compare objects according to the input.
+        Returns a list of Compare objects in the order of the input nodes, replacing each list or tuple of inputs
+        with the Compare object built from it. Compact Compare objects built in other processes share their elements
+        with those of the current process.
+        :param nodes: list, containing Compare objects and lists or tuples of the inputs necessary to create them
+        :param built: list, the Compare objects created from the lists or tuples of inputs, in order
+        """
+        for node in built:
+            if node.compact:
+                node._share_elements()
+        built = iter(built)
+        return [node if isinstance(node, Compare) else next(built) for node in nodes]
+
+    def add_hierarchy(self, hierarchy, lazy=False):
+        """
+        Builds a hierarchy of the stored Compare objects according to the input. Every name in the hierarchy
+        is looked up and checked before any Compare object is linked, then every parent is linked to its children
+        and the weights of the whole hierarchy are computed once, rather than once for each parent.
         :param hierarchy: dictionary, a representation of the hierarchy in which each key of the dictionary
             is the name of a parent and each value is a list of names of one or more of its children
             Example: {'a': ['b', 'c'], 'b': ['d', 'e']}
+        :param lazy: boolean, whether to defer computing the weights of the hierarchy until they are next accessed,
+            in which case they are computed once for the whole hierarchy; default is False
         """
         try:
-            self.hierarchy = hierarchy
-            for name in self.hierarchy.keys():
-                children = [self._get_node(child_name) for child_name in self.hierarchy[name]]
-                self._get_node(name).add_children(children)
+            parents = [self._get_node(name) for name in hierarchy.keys()]
         except AttributeError:
+            parents = [None]
+        if any(parent is None for parent in parents):
             msg = 'All comparisons must be added to the Compose object before adding a hierarchy.'
             raise AttributeError(msg)
+        children = [[self._get_node(child_name) for child_name in child_names] for child_names in hierarchy.values()]
+        if not all(isinstance(child, Compare) for child in itertools.chain.from_iterable(children)):
+            msg = 'A Compare object is either misconfigured or missing from the hierarchy.'
+            raise TypeError(msg)
+
+        self.hierarchy = hierarchy
+        for parent, parent_children in zip(parents, children):
+            parent.add_children(parent_children, lazy=True)
+        if not lazy:
+            for root in dict.fromkeys(parent._get_root() for parent in parents):
+                root._recompute_hierarchy()
+
+    async def aadd_hierarchy(self, hierarchy, lazy=False, executor=None):
+        """
+        Builds a hierarchy of the stored Compare objects according to the input, synthesizing its weights
+        in an executor so that doing so does not block the running event loop; see 'add_hierarchy()'.
+        The stored Compare objects should not be changed by other tasks until the hierarchy is built.
+        :param hierarchy: dictionary, a representation of the hierarchy in which each key of the dictionary
+            is the name of a parent and each value is a list of names of one or more of its children
+            Example: {'a': ['b', 'c'], 'b': ['d', 'e']}
+        :param lazy: boolean, whether to defer computing the weights of the hierarchy until they are next accessed,
+            in which case they are computed once for the whole hierarchy; default is False
+        :param executor: concurrent.futures.Executor, the executor in which to build the hierarchy, which must share
+            memory with the current process, such as a ThreadPoolExecutor; if None, the default executor
+            of the event loop is used; default is None
+        """
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            msg = 'A hierarchy cannot be built in a ProcessPoolExecutor. Use a ThreadPoolExecutor instead.'
+            raise TypeError(msg)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, functools.partial(self.add_hierarchy, hierarchy, lazy))
 
     def report(self, name=None, show=False, verbose=False):
         """
@@ -604,5 +2721,513 @@ class Compose:
         if name:
             report = self._get_node(name).report(complete=False, show=show, verbose=verbose)
         else:
-            report = self._get_node(list(self.hierarchy.keys())[0]).report(complete=True, show=show, verbose=verbose)
+            report = self._get_top_node().report(complete=True, show=show, verbose=verbose)
         return report
+
+    def iter_report(self, name=None, verbose=False):
+        """
+        Yields the key information of the stored Compare objects as dictionaries, one Compare object at a time;
+        see 'report()'.
+        :param name: string, the name of the Compare object report to yield; if None, yields a complete report
+            for the given hierarchy; default is None
+        :param verbose: boolean, whether to include full details of the Compare object within the report;
+            default is False
+        """
+        if name:
+            return self._get_node(name).iter_report(complete=False, verbose=verbose)
+        return self._get_top_node().iter_report(complete=True, verbose=verbose)
+
+    def write_report(self, file, name=None, verbose=False, ndjson=False, indent=None):
+        """
+        Writes the key information of the stored Compare objects to a file as JSON, one Compare object at a time;
+        see 'Compare.write_report()'.
+        :param file: file, a file-like object opened for writing text, such as an open file or sys.stdout
+        :param name: string, the name of the Compare object report to write; if None, writes a complete report
+            for the given hierarchy; default is None
+        :param verbose: boolean, whether to include full details of the Compare object within the report;
+            default is False
+        :param ndjson: boolean, whether to write newline-delimited JSON, with the report of each Compare object
+            on its own line, rather than a single JSON object; default is False
+        :param indent: integer, the number of spaces by which to indent nested JSON objects; if None, each JSON object
+            is written on a single line; ignored if 'ndjson' is True; default is None
+        """
+        _write_json_reports(file, self.iter_report(name, verbose), not name, ndjson, indent)
+
+    def to_columns(self):
+        """
+        Returns the weights, consistency ratios and computed comparisons of every Compare object in the hierarchy
+        as columns of numpy arrays, with the names of the Compare objects and their elements dictionary-encoded;
+        see 'ReportColumns'.
+        """
+        columns = ReportColumns()
+        columns.append(self)
+        return columns
+
+    def save(self, path):
+        """
+        Saves the stored Compare objects and the hierarchy to a NumPy '.npz' file, including the completed matrices,
+        weights and consistency ratios of the Compare objects, so that they can be loaded without being recomputed;
+        see 'load()'.
+        :param path: string or file, the file to which to save; '.npz' is appended to a path that lacks it
+        """
+        hierarchy = list(self.hierarchy.items()) if self.hierarchy is not None else None
+        _save_nodes(path, self.nodes, {'compose': {'nodes': len(self.nodes), 'hierarchy': hierarchy}})
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns the Compose object saved to the input file by 'save()'. No missing comparisons, priority vectors
+        or consistency ratios are recomputed; only the weights of the hierarchy are synthesized again.
+        :param path: string or file, the file from which to load
+        """
+        nodes, metadata = _load_nodes(path)
+        compose = cls()
+        for node in nodes[:metadata['compose']['nodes']]:
+            compose._add_node(node)
+        hierarchy = metadata['compose']['hierarchy']
+        compose.hierarchy = dict(hierarchy) if hierarchy is not None else None
+        return compose
+
+
+class CompareBatch:
+    """
+    This class computes the priority vectors and consistency ratios of a batch of positive reciprocal matrices
+    sharing the same elements, using vectorized operations over the whole batch rather than one Compare object
+    per matrix. The results are identical to the 'local_weights' and 'consistency_ratio' of the equivalent
+    Compare objects, but are returned as numpy arrays. Matrices can be screened by their consistency ratios
+    and the consistent ones aggregated into a single Compare object; see 'screen()' and 'aggregate()'.
+    :param comparisons: numpy array, dictionary, list or tuple, either (i) a stacked array of shape (n, k, k)
+        containing n complete positive reciprocal matrices, (ii) a dictionary of columns, in which each key is a tuple
+        of two elements and each value is a sequence or numpy array of the n values of their pairwise comparison,
+        such as the columns of a survey export, or (iii) a list or tuple of n dictionaries of pairwise comparison
+        values, each in the form accepted by the Compare class; every pair of the same k elements must be compared
+        Examples: (i) np.ones((2, 3, 3)), (ii) {('a', 'b'): [3, 1], ('a', 'c'): [2, 5], ('b', 'c'): [1, 3]},
+        (iii) [{('a', 'b'): 3, ('a', 'c'): 2, ('b', 'c'): 1}, {('a', 'b'): 1, ...}]
+    :param elements: list or tuple, the names of the k elements, which determine the order of the columns of the
+        results; if None, the elements are taken from the first dictionary in the order in which they appear, or
+        are numbered from 0 to k - 1 if the input is an array; default is None
+    :param precision: integer, number of decimal places used when computing both the priority
+        vectors and the consistency ratios; default is 4
+    :param random_index: string, the random index estimates used to compute the consistency ratios;
+        valid input: 'dd', 'saaty'; default is 'dd'
+    :param iterations: integer, number of iterations before the 'squaring' and 'power' methods stop;
+        default is 100
+    :param cr: boolean, whether to compute the consistency ratios of the priority vectors; default is True
+    :param method: string, the method used to compute the priority vectors;
+        see 'Compare._compute_priority_vector()' for more information regarding the different methods;
+        valid input: 'squaring', 'power', 'eigen', 'geometric'; default is 'squaring'
+    """
+
+    def __init__(self, comparisons, elements=None, precision=4, random_index='dd', iterations=100, cr=True,
+                 method='squaring'):
+        self.precision = precision
+        self.random_index = random_index.lower() if cr else None
+        self.iterations = iterations
+        self.cr = cr
+        self.method = method.lower()
+
+        self.elements = list(elements) if elements is not None else None
+        self._size = None
+        self._matrices = None
+        self._lambda_max = None
+
+        self.local_weights = None
+        self.consistency_ratios = None
+
+        _check_method(self.method)
+        if isinstance(comparisons, np.ndarray):
+            self._build_array_matrices(comparisons)
+        elif isinstance(comparisons, dict):
+            self._build_column_matrices(comparisons)
+        else:
+            self._build_dict_matrices(comparisons)
+        self._check_matrices()
+        if self.cr:
+            _check_random_index_size(self._size, self.random_index)
+        self.local_weights, self._lambda_max = _compute_priority_vectors(self._matrices, self.method,
+                                                                         self.iterations, self.precision)
+        if self.cr:
+            self._compute_consistency_ratios()
+
+    def __len__(self):
+        return len(self._matrices)
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    def _build_array_matrices(self, matrices):
+        """
+        Sets the stacked matrices of the CompareBatch object from an input array.
+        :param matrices: numpy array, the stacked matrices of shape (n, k, k)
+        """
+        if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+            msg = f'An input array of shape {matrices.shape} is invalid. The input array must be of shape (n, k, k).'
+            raise ValueError(msg)
+        self._matrices = np.array(matrices, float)
+        self._size = self._matrices.shape[1]
+        if self.elements is None:
+            self.elements = list(range(self._size))
+        elif len(self.elements) != self._size:
+            msg = f'The number of elements ({len(self.elements)}) must equal the size of the ' \
+                  f'input matrices ({self._size}).'
+            raise ValueError(msg)
+        # Missing comparisons are reported by '_check_matrices()' rather than as unreciprocated comparisons
+        products = self._matrices * np.swapaxes(self._matrices, 1, 2)
+        reciprocal = np.isclose(products, 1) | np.isnan(products)
+        if not np.all(reciprocal):
+            number, row, column = np.argwhere(~reciprocal)[0]
+            msg = f'Comparison matrix {number} is not reciprocal: the value in row {row}, column {column} ' \
+                  f'must be the reciprocal of the value in row {column}, column {row}.'
+            raise ValueError(msg)
+
+    def _build_dict_matrices(self, comparisons):
+        """
+        Sets the stacked matrices of the CompareBatch object from a sequence of comparison dictionaries.
+        :param comparisons: list or tuple, the dictionaries of pairwise comparison values
+        """
+        if self.elements is None:
+            self.elements = list(dict.fromkeys(itertools.chain.from_iterable(comparisons[0])))
+        self._size = len(self.elements)
+        indices = {element: index for index, element in enumerate(self.elements)}
+
+        self._matrices = np.full((len(comparisons), self._size, self._size), np.nan)
+        self._matrices[:, np.arange(self._size), np.arange(self._size)] = 1.0
+        for number, comparison in enumerate(comparisons):
+            try:
+                rows, columns, values = _comparison_locations(comparison, indices)
+            except KeyError as error:
+                msg = f'Comparison dictionary {number} contains the element {error}, ' \
+                      f'which is not one of the elements {self.elements}.'
+                raise ValueError(msg)
+            self._matrices[number, rows, columns] = values
+            self._matrices[number, columns, rows] = np.reciprocal(values)
+
+    def _build_column_matrices(self, comparisons):
+        """
+        Sets the stacked matrices of the CompareBatch object from a dictionary of columns of comparison values,
+        filling every matrix at once.
+        If both a comparison and its inverse are present, only the last one to appear is kept.
+        :param comparisons: dictionary, each key is a tuple of two elements and each value is the sequence
+            of the values of their pairwise comparison, one for each matrix
+        """
+        if self.elements is None:
+            self.elements = list(dict.fromkeys(itertools.chain.from_iterable(comparisons)))
+        self._size = len(self.elements)
+        indices = {element: index for index, element in enumerate(self.elements)}
+
+        locations = {}
+        for key, values in comparisons.items():
+            try:
+                i, j = indices[key[0]], indices[key[1]]
+            except KeyError as error:
+                msg = f'The comparison {key} contains the element {error}, which is not one of the elements ' \
+                      f'{self.elements}.'
+                raise ValueError(msg)
+            locations.pop((j, i), None)
+            locations[(i, j)] = values
+        try:
+            values = np.array(tuple(locations.values()), float)
+        except ValueError:
+            values = None
+        if values is None or values.ndim != 2:
+            msg = 'Every comparison must have the same number of values.'
+            raise ValueError(msg)
+        rows, columns = np.array(tuple(locations), int).T
+
+        self._matrices = np.full((values.shape[1], self._size, self._size), np.nan)
+        self._matrices[:, np.arange(self._size), np.arange(self._size)] = 1.0
+        self._matrices[:, rows, columns] = values.T
+        self._matrices[:, columns, rows] = np.reciprocal(values.T)
+
+    def _check_matrices(self):
+        """
+        Raises a ValueError if any matrix is missing a comparison or contains a value that is not greater than zero.
+        """
+        missing = np.isnan(self._matrices).any(axis=(1, 2))
+        if np.any(missing):
+            msg = f'Comparison matrix {np.flatnonzero(missing)[0]} is missing comparisons. ' \
+                  'Use the Compare class to compute optimal values for missing comparisons.'
+            raise ValueError(msg)
+        if not np.all(self._matrices > 0):
+            msg = 'All input values must be greater than zero.'
+            raise ValueError(msg)
+
+    def _compute_consistency_ratios(self):
+        """
+        Sets the 'consistency_ratios' property of the CompareBatch object;
+        see 'Compare._compute_consistency_ratio()' for more information.
+        """
+        # A valid, square, reciprocal matrix with only one or two rows must be consistent
+        if self._size < 3:
+            self.consistency_ratios = np.zeros(len(self._matrices))
+            return
+        random_index = _get_random_index(self._size, self.random_index)
+        if random_index is None:
+            return
+
+        lambda_max = self._lambda_max
+        if lambda_max is None:
+            lambda_max = np.max(_eigvals(self._matrices), axis=1)
+        elif np.isnan(lambda_max).any():
+            # Only the principal eigenvalues of the inconsistent matrices are unknown
+            unknown = np.isnan(lambda_max)
+            lambda_max = lambda_max.copy()
+            lambda_max[unknown] = np.max(np.real(_eigvals(self._matrices[unknown])), axis=1)
+        consistency_index = (lambda_max - self._size) / (self._size - 1)
+        self.consistency_ratios = np.abs(np.real(consistency_index / random_index).round(self.precision))
+
+    def screen(self, threshold=0.1):
+        """
+        Returns a boolean numpy array of shape (n,) that is True for each matrix whose consistency ratio
+        is less than or equal to the threshold.
+        :param threshold: float, the largest acceptable consistency ratio; default is 0.1
+        """
+        if self.consistency_ratios is None:
+            msg = 'The consistency ratios of the matrices have not been computed, so they cannot be screened.'
+            raise ValueError(msg)
+        return self.consistency_ratios <= threshold
+
+    def aggregate(self, name, threshold=None):
+        """
+        Returns a Compare object of the geometric means of the comparisons of the matrices (the aggregation of
+        individual judgments), computed over all matrices at once, with the same parameters as the CompareBatch
+        object. The Compare object can be used anywhere a Compare object can, including as a node of a hierarchy.
+        :param name: string, the name of the Compare object
+        :param threshold: float, the largest consistency ratio of the matrices to aggregate, so that inconsistent
+            matrices are left out; see 'screen()'; if None, every matrix is aggregated; default is None
+        """
+        mask = self.screen(threshold) if threshold is not None else np.ones(len(self), bool)
+        if not np.any(mask):
+            msg = f'No matrix has a consistency ratio less than or equal to {threshold}.'
+            raise ValueError(msg)
+        log_means = np.mean(np.log(self._matrices[mask]), axis=0)
+        rows, columns = np.triu_indices(self._size, 1)
+        comparisons = {(self.elements[row], self.elements[column]): value
+                       for row, column, value in zip(rows, columns, np.exp(log_means[rows, columns]).tolist())}
+        return Compare(name, comparisons, self.precision, self.random_index or 'dd', self.iterations, cr=self.cr,
+                       method=self.method)
+
+
+def _get_hierarchy_root(hierarchy):
+    """
+    Returns the Compare object at the top of the input hierarchy.
+    Raises a ValueError if the input is a Compose object to which no hierarchy has been added.
+    :param hierarchy: Compare or Compose object, the hierarchy
+    """
+    if isinstance(hierarchy, Compose):
+        return hierarchy._get_top_node()._get_root()
+    elif isinstance(hierarchy, Compare):
+        return hierarchy._get_root()
+    msg = 'The hierarchy must be either a Compare or a Compose object.'
+    raise TypeError(msg)
+
+
+def _check_report_table(table):
+    """
+    Raises a ValueError if the input is not the name of a table of a ReportColumns object.
+    :param table: string, the name of the table
+    """
+    if table not in _REPORT_COLUMNS:
+        msg = f"'{table}' is an invalid table. Valid tables are: {', '.join(_REPORT_COLUMNS)}."
+        raise ValueError(msg)
+
+
+def _import_pyarrow(module):
+    """
+    Returns the input pyarrow module, which is an optional dependency imported only when it is needed.
+    :param module: string, the name of the module
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        msg = "Writing Arrow tables requires pyarrow, which can be installed using 'pip install pyarrow'."
+        raise ImportError(msg) from None
+
+
+# The columns of each table of a ReportColumns object and their types; the values of the columns in
+# '_NODE_COLUMNS' are the same for every row of a Compare object, so they are stored once per Compare object
+# until the columns are built
+_REPORT_COLUMNS = {'elements': {'hierarchy': np.int64, 'node': np.int32, 'element': np.int32,
+                                'local_weight': np.float64, 'global_weight': np.float64,
+                                'consistency_ratio': np.float64},
+                   'comparisons': {'hierarchy': np.int64, 'node': np.int32, 'first': np.int32, 'second': np.int32,
+                                   'value': np.float64}}
+_NODE_COLUMNS = ('hierarchy', 'node', 'consistency_ratio')
+_NAME_COLUMNS = ('node', 'element', 'first', 'second')
+_ARROW_FORMATS = ('parquet', 'feather')
+# The element codes of Compare objects with more elements than this are kept as arrays rather than lists
+_ENCODED_ARRAY_SIZE = 64
+
+
+class ReportColumns:
+    """
+    This class collects the results of any number of hierarchies into two tables of numpy arrays, ready to be
+    analyzed together or written to a single Parquet or Feather file. The 'elements' table has a row for each
+    element of each Compare object, with its local and global weights and the consistency ratio of the Compare object;
+    the 'comparisons' table has a row for each computed comparison. Each appended hierarchy is numbered in turn,
+    and the names of the Compare objects and their elements are dictionary-encoded: each name is stored once in
+    'names', and the columns hold its position in that list. The rows of each Compare object are added as whole
+    arrays, and the columns are only concatenated when they are accessed.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+        self._codes = {}
+        self._names = None
+        self._tables = {table: {column: np.empty(0, dtype) for column, dtype in columns.items()}
+                        for table, columns in _REPORT_COLUMNS.items()}
+        self._pending = {table: collections.defaultdict(list) for table in _REPORT_COLUMNS}
+
+    def __len__(self):
+        return len(self.elements['hierarchy'])
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    @property
+    def names(self):
+        if self._names is None or len(self._names) != len(self._codes):
+            self._names = list(self._codes)
+        return self._names
+
+    @property
+    def elements(self):
+        return self._get_table('elements')
+
+    @property
+    def comparisons(self):
+        return self._get_table('comparisons')
+
+    def _encode(self, names):
+        """
+        Returns the codes of the input names as a list, adding any new names to the dictionary.
+        :param names: list, the names to encode
+        """
+        codes = self._codes
+        return [codes.setdefault(name, len(codes)) for name in names]
+
+    def append(self, hierarchy):
+        """
+        Adds the results of every Compare object in a hierarchy to the tables; see 'extend()'.
+        :param hierarchy: Compare or Compose object, the hierarchy to add; if a Compare object,
+            the whole hierarchy to which it belongs is added
+        """
+        self.extend([hierarchy])
+
+    def extend(self, hierarchies):
+        """
+        Adds the results of every Compare object in each of the input hierarchies to the tables, numbering the
+        hierarchies in turn. The elements of Compare objects that share the same list of elements,
+        such as compact Compare objects created from the same alternatives, are only encoded once.
+        :param hierarchies: iterable, the Compare or Compose objects of the hierarchies to add; each Compare object
+            stands for the whole hierarchy to which it belongs
+        """
+        codes = self._codes
+        elements = self._pending['elements']
+        comparisons = self._pending['comparisons']
+        # The encoded lists are kept alive until the end, so that their ids are not reused
+        element_codes = {}
+        for hierarchy in hierarchies:
+            root = _get_hierarchy_root(hierarchy)
+            root._refresh()
+            for node in root._iter_hierarchy():
+                node_code = codes.setdefault(node.name, len(codes))
+                encoded = element_codes.get(id(node._elements))
+                if encoded is None:
+                    encoded = self._encode(node._elements)
+                    if len(encoded) > _ENCODED_ARRAY_SIZE:
+                        encoded = np.array(encoded, np.int32)
+                    element_codes[id(node._elements)] = (node._elements, encoded)
+                else:
+                    encoded = encoded[1]
+                elements['rows'].append(len(node._elements))
+                elements['hierarchy'].append(self.count)
+                elements['node'].append(node_code)
+                elements['consistency_ratio'].append(np.nan if node.consistency_ratio is None
+                                                     else node.consistency_ratio)
+                elements['element'].append(encoded)
+                elements['local_weight'].append(node._priority_vector)
+                elements['node_weight'].append(node._global_weight)
+                elements['precision'].append(node.precision)
+                if node._missing_comparisons:
+                    pairs = list(node._missing_comparisons)
+                    comparisons['rows'].append(len(pairs))
+                    comparisons['hierarchy'].append(self.count)
+                    comparisons['node'].append(node_code)
+                    comparisons['first'].append(self._encode([first for first, second in pairs]))
+                    comparisons['second'].append(self._encode([second for first, second in pairs]))
+                    comparisons['value'].append(list(node._missing_comparisons.values()))
+            self.count += 1
+
+    def _get_table(self, table):
+        """
+        Returns the columns of a table as a dictionary of numpy arrays, first concatenating any pending rows
+        onto the existing columns.
+        :param table: string, the name of the table; valid input: 'elements', 'comparisons'
+        """
+        pending = self._pending[table]
+        columns = self._tables[table]
+        if not pending:
+            return columns
+        rows = np.array(pending['rows'], np.int64)
+        values = {}
+        for column, dtype in _REPORT_COLUMNS[table].items():
+            if column == 'global_weight':
+                continue
+            elif column in _NODE_COLUMNS:
+                values[column] = np.repeat(np.array(pending[column], dtype), rows)
+            else:
+                values[column] = np.concatenate(pending[column]).astype(dtype, copy=False)
+        if table == 'elements':
+            # The global weights are rounded together for each precision, as each Compare object rounds its own
+            node_weights = np.repeat(np.array(pending['node_weight'], float), rows) * values['local_weight']
+            precisions = np.array(pending['precision'])
+            if np.all(precisions == precisions[0]):
+                values['global_weight'] = np.round(node_weights, precisions[0])
+            else:
+                values['global_weight'] = np.empty_like(node_weights)
+                for precision in np.unique(precisions):
+                    mask = np.repeat(precisions == precision, rows)
+                    values['global_weight'][mask] = np.round(node_weights[mask], precision)
+        # A new dictionary is built, so that the columns returned before are not changed by adding more rows
+        self._tables[table] = {column: np.concatenate([columns[column], values[column]]) if len(columns[column])
+                               else values[column] for column in _REPORT_COLUMNS[table]}
+        pending.clear()
+        return self._tables[table]
+
+    def to_arrow(self, table='elements'):
+        """
+        Returns a table as a pyarrow Table, in which the columns of names are dictionary arrays sharing 'names',
+        converted to strings, and a missing consistency ratio is null. Requires pyarrow.
+        :param table: string, the name of the table; valid input: 'elements', 'comparisons'; default is 'elements'
+        """
+        _check_report_table(table)
+        pyarrow = _import_pyarrow('pyarrow')
+        names = pyarrow.array([str(name) for name in self.names], pyarrow.string())
+        arrays = {}
+        for column, values in self._get_table(table).items():
+            if column in _NAME_COLUMNS:
+                arrays[column] = pyarrow.DictionaryArray.from_arrays(values, names)
+            elif column == 'consistency_ratio':
+                arrays[column] = pyarrow.array(values, mask=np.isnan(values))
+            else:
+                arrays[column] = pyarrow.array(values)
+        return pyarrow.table(arrays)
+
+    def write(self, path, table='elements', format='parquet'):
+        """
+        Writes a table to a Parquet or Feather file; see 'to_arrow()'. Requires pyarrow.
+        :param path: string or file, the file to which to write
+        :param table: string, the name of the table; valid input: 'elements', 'comparisons'; default is 'elements'
+        :param format: string, the file format; valid input: 'parquet', 'feather'; default is 'parquet'
+        """
+        _check_report_table(table)
+        if format not in _ARROW_FORMATS:
+            msg = f"'{format}' is an invalid file format. Valid file formats are: {', '.join(_ARROW_FORMATS)}."
+            raise ValueError(msg)
+        arrow_table = self.to_arrow(table)
+        if format == 'parquet':
+            _import_pyarrow('pyarrow.parquet').write_table(arrow_table, path)
+        else:
+            _import_pyarrow('pyarrow.feather').write_feather(arrow_table, path)
@@ -0,0 +1,157 @@
+import numpy as np
+
+from .ahpy import _compute_priority_vectors, _get_hierarchy_root
+
+# The priority vectors of the perturbed matrices are not rounded, so that rounding does not hide small changes
+_SAMPLE_PRECISION = 15
+
+
+class Sensitivity:
+    """
+    This class estimates how robust the target weights of a hierarchy are to uncertainty in its judgments.
+    Every input comparison of every Compare object in the hierarchy is multiplied by a random factor, once per sample,
+    then the priority vectors of all perturbed matrices of a Compare object are computed together and the levels of
+    the hierarchy are synthesized for all samples at once using stacked numpy arrays.
+    Missing comparisons keep their computed values and are not recomputed for each sample.
+    :param hierarchy: Compare or Compose object, the hierarchy to analyze; if a Compare object,
+        the whole hierarchy to which it belongs is analyzed
+    :param samples: integer, the number of perturbed hierarchies; default is 1000
+    :param distribution: string or function, the distribution of the random factors; 'lognormal' draws the logarithm
+        of each factor from a normal distribution with a standard deviation of 'scale', 'uniform' draws it uniformly
+        from the interval [-scale, scale]; a function is called with a numpy random Generator and a shape and must
+        return an array of positive factors of that shape; default is 'lognormal'
+    :param scale: float, the spread of the logarithms of the random factors; default is 0.1
+    :param confidence: float, the confidence level of the intervals of the target weights; default is 0.95
+    :param seed: integer, the seed of the random number generator; default is None
+    """
+
+    def __init__(self, hierarchy, samples=1000, distribution='lognormal', scale=0.1, confidence=0.95, seed=None):
+        self.samples = samples
+        self.distribution = distribution
+        self.scale = scale
+        self.confidence = confidence
+        self.seed = seed
+
+        self._root = _get_hierarchy_root(hierarchy)
+        self._rng = np.random.default_rng(seed)
+
+        self.elements = None
+        self.baseline = None
+        self.weights = None
+        self.mean = None
+        self.intervals = None
+        self.rank_reversal = None
+
+        self._check_distribution()
+        self._compute()
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    def _check_distribution(self):
+        """
+        Raises a ValueError if the distribution is neither a valid distribution name nor a function.
+        """
+        if not callable(self.distribution) and self.distribution not in ('lognormal', 'uniform'):
+            msg = f"'{self.distribution}' is an invalid distribution. " \
+                  "Valid distributions are: lognormal, uniform, or a function."
+            raise ValueError(msg)
+
+    def _draw_factors(self, shape):
+        """
+        Returns an array of random factors of the given shape.
+        :param shape: tuple, the shape of the array
+        """
+        if self.distribution == 'lognormal':
+            return np.exp(self._rng.normal(0, self.scale, shape))
+        elif self.distribution == 'uniform':
+            return np.exp(self._rng.uniform(-self.scale, self.scale, shape))
+        return np.asarray(self.distribution(self._rng, shape), float)
+
+    def _compute_node_vectors(self, node, samples, perturb):
+        """
+        Returns the priority vectors of the perturbed matrices of a Compare object as an array of shape (samples, k).
+        :param node: Compare object, the node whose matrix is perturbed
+        :param samples: integer, the number of perturbed matrices
+        :param perturb: boolean, whether to perturb the matrix; if False, returns the unperturbed priority vector
+        """
+        if node._normalize:
+            values = np.broadcast_to(node._matrix, (samples, node._size))
+            if perturb:
+                values = values * self._draw_factors(values.shape)
+            return np.divide(values, np.sum(values, axis=1, keepdims=True))
+
+        rows, columns, _ = node._input_locations
+        vectors = np.empty((samples, node._size))
+        # Perturbing the matrices in chunks bounds the memory used by large matrices and many samples
+        chunk_size = max(1, 2 ** 22 // node._size ** 2)
+        for start in range(0, samples, chunk_size):
+            matrices = np.repeat(node._matrix[np.newaxis], min(chunk_size, samples - start), axis=0)
+            if perturb:
+                factors = self._draw_factors((len(matrices), len(rows)))
+                matrices[:, rows, columns] *= factors
+                matrices[:, columns, rows] /= factors
+            vectors[start:start + len(matrices)] = _compute_priority_vectors(matrices, node.method, node.iterations,
+                                                                             _SAMPLE_PRECISION)[0]
+        return vectors
+
+    def _synthesize(self, node, samples, perturb, elements):
+        """
+        Returns the target weights of the hierarchy below a Compare object for every sample
+        as an array of shape (samples, len(elements)), adding any new target elements to 'elements'.
+        :param node: Compare object, the top of the hierarchy to synthesize
+        :param samples: integer, the number of samples
+        :param perturb: boolean, whether to perturb the judgments
+        :param elements: dictionary, each key is a target element and each value is its column in the results
+        """
+        vectors = self._compute_node_vectors(node, samples, perturb)
+        if not node._node_children:
+            columns = [elements.setdefault(element, len(elements)) for element in node._elements]
+            weights = np.zeros((samples, len(elements)))
+            weights[:, columns] = vectors
+            return weights
+
+        children = {child.name: child for child in node._node_children}
+        weights = np.zeros((samples, len(elements)))
+        for index, element in enumerate(node._elements):
+            if element in children:
+                child_weights = self._synthesize(children[element], samples, perturb, elements)
+                weights = np.pad(weights, ((0, 0), (0, len(elements) - weights.shape[1])))
+                weights[:, :child_weights.shape[1]] += vectors[:, index, np.newaxis] * child_weights
+        return weights
+
+    def _compute(self):
+        """
+        Runs all functions necessary for building the baseline and perturbed target weights of the hierarchy,
+        then computes their means, confidence intervals and rank reversal probabilities.
+        """
+        elements = {}
+        baseline = self._synthesize(self._root, 1, False, elements)[0]
+        weights = self._synthesize(self._root, self.samples, True, elements)
+
+        order = np.argsort(-baseline, kind='stable')
+        self.elements = [list(elements)[index] for index in order]
+        self.baseline = baseline[order]
+        self.weights = weights[:, order]
+        self.mean = np.mean(self.weights, axis=0)
+
+        tail = (1 - self.confidence) / 2
+        low, high = np.quantile(self.weights, (tail, 1 - tail), axis=0)
+        self.intervals = dict(zip(self.elements, zip(low.tolist(), high.tolist())))
+
+        # The rank of an element is the number of elements with a greater weight in the same sample
+        ranks = np.argsort(np.argsort(-self.weights, axis=1, kind='stable'), axis=1, kind='stable')
+        reversals = np.mean(ranks != np.arange(len(self.elements)), axis=0)
+        self.rank_reversal = dict(zip(self.elements, reversals.tolist()))
+
+    def report(self):
+        """
+        Returns the key information of the Sensitivity object as a dictionary, in which each key is a target element
+        and each value is a dictionary of that element's baseline and mean target weights, confidence interval
+        and rank reversal probability.
+        """
+        return {element: {'baseline': self.baseline[index].item(),
+                          'mean': self.mean[index].item(),
+                          'interval': self.intervals[element],
+                          'rank_reversal': self.rank_reversal[element]}
+                for index, element in enumerate(self.elements)}
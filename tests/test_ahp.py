@@ -1,5 +1,11 @@
+import asyncio
+import concurrent.futures
+import io
 import itertools
+import json
+import weakref
 
+import numpy as np
 import pytest
 
 from src import ahpy
@@ -111,6 +117,37 @@ def test_cities_target_weights():
     assert t.target_weights is None
 
 
+def test_cities_update_comparison():
+    nodes = [ahpy.Compare(name, comparisons, precision=4) for name, comparisons in
+             (('Culture', culture), ('Family', family), ('Housing', housing), ('Jobs', jobs),
+              ('Transportation', transportation))]
+    cr = ahpy.Compare('Goal', criteria, precision=4)
+    cr.add_children(nodes)
+    nodes[0].update_comparison(('Pittsburgh', 'Boston'), 3)
+    cr.update_comparisons({('Culture', 'Family'): 1, ('Housing', 'Transportation'): 2})
+
+    updated_culture = {key: value for key, value in culture.items() if key != ('Boston', 'Pittsburgh')}
+    updated_criteria = {key: value for key, value in criteria.items() if key != ('Family', 'Culture')}
+    cu = ahpy.Compare('Culture', {**updated_culture, ('Pittsburgh', 'Boston'): 3}, precision=4)
+    f = ahpy.Compare('Family', family, precision=4)
+    h = ahpy.Compare('Housing', housing, precision=4)
+    j = ahpy.Compare('Jobs', jobs, precision=4)
+    t = ahpy.Compare('Transportation', transportation, precision=4)
+    rebuilt = ahpy.Compare('Goal', {**updated_criteria, ('Culture', 'Family'): 1, ('Housing', 'Transportation'): 2},
+                           precision=4)
+    rebuilt.add_children([cu, f, h, j, t])
+
+    assert cr.target_weights == rebuilt.target_weights
+    assert nodes[0].global_weights == cu.global_weights
+    assert nodes[0].target_weights is None
+
+
+def test_update_invalid_comparison():
+    cx = ahpy.Compare('Culture', culture)
+    with pytest.raises(ValueError):
+        cx.update_comparison(('Boston', 'Denver'), 2)
+
+
 # Examples from Bozóki, S., Fülöp, J. and Rónyai, L., 'On optimal completion of incomplete
 # pairwise comparison matrices,' Mathematical and Computer Modelling, 52:1–2, 2010, pp. 318-333.
 # https://doi.org/10.1016/j.mcm.2010.02.047
@@ -151,6 +188,65 @@ def test_incomplete_housing_missing_comparisons():
                            ('f', 'g'): 0.2912120796181874, ('g', 'h'): 0.4030898885178746}))
 
 
+def test_incomplete_example_matrix():
+    cu = ahpy.Compare('Incomplete Example', u)
+    rows, columns = cu._missing_locations
+    assert [(cu._elements[row], cu._elements[column]) for row, column in zip(rows, columns)] == [('c', 'd')]
+    assert np.allclose(cu._matrix * cu._matrix.T, 1)
+
+
+@pytest.mark.parametrize('completion', ['llsm', 'newton'])
+def test_incomplete_example_completion_methods(completion):
+    cu = ahpy.Compare('Incomplete Example', u, completion=completion)
+    assert cu._missing_comparisons == pytest.approx({('c', 'd'): 0.730297106886979})
+    assert cu.local_weights == {'a': 0.3738, 'b': 0.392, 'c': 0.0985, 'd': 0.1357}
+
+
+def test_incomplete_disconnected_completion():
+    with pytest.raises(ValueError):
+        ahpy.Compare('Disconnected', {('a', 'b'): 2, ('c', 'd'): 3}, completion='llsm')
+
+
+@pytest.mark.parametrize('completion', ['cyclic', 'newton'])
+def test_incomplete_warm_start(completion):
+    cu = ahpy.Compare('Incomplete Example', u, completion=completion)
+    for warm_start in ('llsm', {('d', 'c'): 1.4}, cu):
+        with ahpy.instrument() as records:
+            cw = ahpy.Compare('Incomplete Example', u, completion=completion, warm_start=warm_start)
+        assert cw._missing_comparisons == pytest.approx({('c', 'd'): 0.730297106886979}, abs=1e-4)
+        assert cw.local_weights == cu.local_weights
+    assert records.totals['completion_sweeps'] == 1
+    with pytest.raises(ValueError):
+        ahpy.Compare('Incomplete Example', u, warm_start='ones')
+    with pytest.raises(ValueError):
+        ahpy.Compare('Incomplete Example', u, warm_start={('c', 'd'): 0})
+
+
+def test_incomplete_perron_root(monkeypatch):
+    comparisons = {(i, j): ((3 * i + 5 * j) % 9 + 1) / ((i + 2 * j) % 4 + 1)
+                   for i, j in itertools.combinations(range(20), 2) if i == 0 or (i + j) % 7}
+    monkeypatch.setattr(ahpy.ahpy, '_PERRON_ITERATION_SIZE', 20)
+    with ahpy.instrument() as records:
+        cp = ahpy.Compare('Power Iteration', comparisons, cr=False)
+    assert records.totals['power_iterations'] > 0
+    monkeypatch.setattr(ahpy.ahpy, '_PERRON_ITERATION_SIZE', 100)
+    ce = ahpy.Compare('Power Iteration', comparisons, cr=False)
+    assert cp._missing_comparisons == pytest.approx(ce._missing_comparisons, rel=1e-4)
+    assert cp.local_weights == ce.local_weights
+
+
+@pytest.mark.parametrize('method', ahpy.PRIORITY_METHODS)
+def test_consistent_fast_path(method):
+    consistent = {('a', 'b'): 2, ('b', 'c'): 3, ('a', 'c'): 6, ('a', 'd'): 1, ('b', 'd'): 0.5, ('c', 'd'): 1 / 6}
+    with ahpy.instrument() as records:
+        cc = ahpy.Compare('Consistent', consistent, method=method)
+        cp = ahpy.Compare('Pair', {('a', 'b'): 3}, method=method)
+    assert cc.local_weights == {'a': 0.375, 'd': 0.375, 'b': 0.1875, 'c': 0.0625}
+    assert cp.local_weights == {'a': 0.75, 'b': 0.25}
+    assert cc.consistency_ratio == cp.consistency_ratio == 0.0
+    assert 'eigen_solves' not in records.totals
+
+
 # Example from Haas, R. and Meixner, L., 'An Illustrated Guide to the Analytic Hierarchy Process,'
 # http://www.inbest.co.il/NGO/ahptutorial.pdf
 
@@ -274,6 +370,31 @@ def test_master_g():
                                       'comparisons': {'count': 3, 'input': {'x': 1, 'y': 2, 'z': 3}, 'computed': None}}
 
 
+def test_master_lazy():
+    la, lb, lc, ld, le, lf, lg = (ahpy.Compare(name, comparisons) for name, comparisons in
+                                  (('a', a_m), ('b', b_m), ('c', c_m), ('d', d_m), ('e', e_m), ('f', f_m), ('g', g_m)))
+    la.add_children([lb, lc], lazy=True)
+    lb.add_children([ld, le], lazy=True)
+    ld.add_children([lf, lg], lazy=True)
+    assert la._stale and not lc._stale
+    assert lg.global_weight == 0.1333
+    assert not la._stale and not lg._stale
+    assert la.report(complete=True, verbose=True) == a.report(complete=True, verbose=True)
+
+
+def test_master_compact():
+    ca, cb, cc, cd, ce, cf, cg = (ahpy.Compare(name, comparisons, compact=True) for name, comparisons in
+                                  (('a', a_m), ('b', b_m), ('c', c_m), ('d', d_m), ('e', e_m), ('f', f_m), ('g', g_m)))
+    ca.add_children([cb, cc])
+    cb.add_children([cd, ce])
+    cd.add_children([cf, cg])
+    assert ca.report(complete=True, verbose=True) == a.report(complete=True, verbose=True)
+    assert cc._elements is cf._elements
+    assert weakref.ref(ca)() is ca
+    ca.label = 'Goal'
+    assert ca.label == 'Goal'
+
+
 # Example from https://en.wikipedia.org/wiki/Analytic_hierarchy_process_%E2%80%93_car_example
 
 cri = ('Cost', 'Safety', 'Style', 'Capacity')
@@ -630,3 +751,528 @@ def test_compose_verbose_report():
                                                                            ('CR-V', 'Odyssey'): 0.5,
                                                                            ('Element', 'Odyssey'): 0.5}),
                                                                       'computed': None}}}
+
+
+def test_compose_stream_report(capsys):
+    assert list(compose.iter_report(verbose=True)) == list(compose.report(verbose=True).values())
+    assert list(compose.iter_report('Cost')) == [compose.report('Cost')]
+    compose.report(show=True, verbose=True)
+    file = io.StringIO()
+    compose.write_report(file, verbose=True, indent=4)
+    assert file.getvalue() + '\n' == capsys.readouterr().out
+    file = io.StringIO()
+    compose.write_report(file)
+    assert json.loads(file.getvalue()) == json.loads(json.dumps(compose.report()))
+    file = io.StringIO()
+    compose.write_report(file, verbose=True, ndjson=True)
+    lines = file.getvalue().splitlines()
+    assert [json.loads(line)['name'] for line in lines] == list(compose.report())
+    assert json.loads(lines[-1])['comparisons']['input']['Accord Sedan, Pilot'] == 0.5
+
+
+def test_batch_dicts_match_compare():
+    batch = ahpy.CompareBatch([dict(zip(pairs, safety_m)), dict(zip(pairs, style_m))], precision=3)
+    for number, comparisons in enumerate((safety_m, style_m)):
+        cx = ahpy.Compare('x', dict(zip(pairs, comparisons)), precision=3)
+        assert dict(zip(batch.elements, batch.local_weights[number])) == cx.local_weights
+        assert batch.consistency_ratios[number] == cx.consistency_ratio
+
+
+def test_batch_array_matches_compare():
+    cx = ahpy.Compare('Drinks', drinks, precision=4)
+    batch = ahpy.CompareBatch(np.stack([cx._matrix, cx._matrix.T]))
+    assert dict(zip(cx._elements, batch.local_weights[0])) == cx.local_weights
+    assert batch.consistency_ratios[0] == batch.consistency_ratios[1] == cx.consistency_ratio
+
+
+def test_batch_missing_comparisons():
+    with pytest.raises(ValueError):
+        ahpy.CompareBatch([{('a', 'b'): 2, ('b', 'c'): 3}])
+
+
+def test_batch_columns_screen_aggregate():
+    respondents = [dict(zip(pairs, matrix)) for matrix in (safety_m, style_m, capacity_pass_m, cost_fuel_m)]
+    columns = {pair: [respondent[pair] for respondent in respondents] for pair in pairs}
+    batch = ahpy.CompareBatch(columns)
+    assert np.array_equal(batch.local_weights, ahpy.CompareBatch(respondents).local_weights)
+
+    mask = batch.screen(0.05)
+    assert mask.tolist() == (batch.consistency_ratios <= 0.05).tolist() and 0 < mask.sum() < len(batch)
+    aggregated = batch.aggregate('Consistent', 0.05)
+    group = ahpy.GroupCompare('Consistent', [respondents[number] for number in np.flatnonzero(mask)], aip=False)
+    assert aggregated.local_weights == group.local_weights
+    assert batch.aggregate('All').local_weights == ahpy.GroupCompare('All', respondents, aip=False).local_weights
+    with pytest.raises(ValueError):
+        ahpy.CompareBatch(respondents[:2]).aggregate('None', 0.05)
+
+
+@pytest.mark.parametrize('method', ['power', 'eigen'])
+def test_drinks_weights_eigenvector_methods(method):
+    c = ahpy.Compare('Drinks', drinks, precision=4, method=method)
+    assert c.local_weights == ahpy.Compare('Drinks', drinks, precision=4).local_weights
+    assert c.consistency_ratio == 0.0235
+
+
+def test_drinks_weights_geometric_method():
+    c = ahpy.Compare('Drinks', drinks, precision=3, method='geometric')
+    assert c.local_weights == {'water': 0.324, 'soda': 0.191, 'coffee': 0.179, 'milk': 0.129, 'beer': 0.116,
+                               'tea': 0.042, 'wine': 0.018}
+
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        ahpy.Compare('Drinks', drinks, method='svd')
+
+
+def test_estimate_random_index():
+    assert ahpy.estimate_random_index(5, samples=4000) == pytest.approx(1.11, abs=0.02)
+    assert ahpy.estimate_random_index(8, samples=300, workers=2) == ahpy.estimate_random_index(8, samples=300)
+
+
+def test_random_index_cache(tmp_path, monkeypatch):
+    cache = tmp_path / 'random_indices.json'
+    cache.write_text('{"100": 1.7, "101": 1.7}')
+    monkeypatch.setattr(ahpy.ahpy, '_estimated_random_indices', None)
+    monkeypatch.setattr(ahpy.ahpy, '_random_index_cache', str(cache))
+    x = {pair: 1 for pair in itertools.combinations(range(101), 2)}
+    x[(0, 1)] = 2
+    cx = ahpy.Compare('CR Test', x, precision=6)
+    lambda_max = np.max(np.real(np.linalg.eigvals(cx._matrix)))
+    assert cx.consistency_ratio == np.round((lambda_max - 101) / 100 / (1.7 * 1.6339 / 1.7311600575215889), 6)
+
+    estimated = []
+    monkeypatch.setattr(ahpy.ahpy, 'estimate_random_index', lambda size: estimated.append(size) or 1.7)
+    with pytest.warns(UserWarning):
+        ahpy.Compare('CR Test', {pair: 1 for pair in itertools.combinations(range(102), 2)})
+    assert estimated == [102]
+
+
+def test_sensitivity_baseline():
+    s = ahpy.sensitivity.Sensitivity(compose, samples=50, scale=0, seed=0)
+    target_weights = compose.Criteria.target_weights
+    assert s.elements == list(target_weights)
+    assert np.round(s.baseline, 3).tolist() == list(target_weights.values())
+    assert all(value == 0 for value in s.rank_reversal.values())
+    assert all(low == high for low, high in s.intervals.values())
+
+
+def test_sensitivity_perturbed():
+    s = ahpy.sensitivity.Sensitivity(a, samples=2000, scale=0.2, seed=0)
+    assert s.elements == ['z', 'y', 'x']
+    assert s.mean == pytest.approx(s.baseline, abs=0.01)
+    assert all(low < weight < high for weight, (low, high) in zip(s.baseline, s.intervals.values()))
+    assert 0 < s.rank_reversal['y'] < 1
+    assert s.report()['z']['rank_reversal'] == s.rank_reversal['z']
+
+
+def test_compose_registry():
+    composed = ahpy.Compose()
+    composed.add_comparisons([('Cost', dict(zip(c_pairs, (2, 5, 3, 2, 2, .5)))),
+                              ('Capacity', {('Cargo', 'Passenger'): 0.2}),
+                              ('Cargo', dict(zip(pairs, capacity_cargo_m))),
+                              ('Passenger', dict(zip(pairs, capacity_pass_m))),
+                              ('Safety', dict(zip(pairs, safety_m)), 3), ('Style', dict(zip(pairs, style_m)), 3),
+                              ('Price', dict(zip(pairs, cost_price_m)), 3), ('Fuel', dict(zip(pairs, cost_fuel_m)), 3),
+                              ('Resale', dict(zip(pairs, cost_resale_m)), 3),
+                              ('Maintenance', dict(zip(pairs, cost_maint_m)), 3, 'saaty')])
+    composed.nodes = composed.nodes + [ahpy.Compare('Criteria', dict(zip(c_cri, (3, 7, 3, 9, 1, 1 / 7))), 3)]
+    assert composed.Criteria is composed['Criteria'] is composed.nodes[-1]
+    assert composed.Missing is None
+    with pytest.raises(AttributeError):
+        composed._missing
+    with pytest.raises(TypeError):
+        composed.add_hierarchy({'Criteria': ['Missing']})
+    with pytest.raises(AttributeError):
+        composed.add_hierarchy({'Missing': ['Criteria']})
+    assert composed.hierarchy is None
+
+    with ahpy.instrument() as records:
+        composed.add_hierarchy(h)
+    assert records.nodes['Criteria']['recompute_calls'] == 1
+    assert composed.report() == compose.report()
+
+
+def test_compose_parallel():
+    parallel = ahpy.Compose()
+    parallel.add_comparisons([('Criteria', dict(zip(c_cri, (3, 7, 3, 9, 1, 1 / 7))), 3),
+                              ('Cost', dict(zip(c_pairs, (2, 5, 3, 2, 2, .5)))),
+                              ('Capacity', {('Cargo', 'Passenger'): 0.2}),
+                              ('Cargo', dict(zip(pairs, capacity_cargo_m))),
+                              ('Passenger', dict(zip(pairs, capacity_pass_m))),
+                              ('Safety', dict(zip(pairs, safety_m)), 3), ('Style', dict(zip(pairs, style_m)), 3),
+                              ('Price', dict(zip(pairs, cost_price_m)), 3), ('Fuel', dict(zip(pairs, cost_fuel_m)), 3),
+                              ['Resale', dict(zip(pairs, cost_resale_m)), 3],
+                              ['Maintenance', dict(zip(pairs, cost_maint_m)), 3, 'saaty']], workers=2)
+    assert [node.name for node in parallel.nodes] == ['Criteria', 'Cost', 'Capacity', 'Cargo', 'Passenger', 'Safety',
+                                                      'Style', 'Price', 'Fuel', 'Resale', 'Maintenance']
+    parallel.add_hierarchy(h)
+    assert parallel.report() == compose.report()
+
+
+def test_compose_async():
+    async def build():
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            criteria = await ahpy.Compare.acreate('Criteria', dict(zip(c_cri, (3, 7, 3, 9, 1, 1 / 7))), 3,
+                                                  executor=executor)
+            composed = ahpy.Compose()
+            await composed.aadd_comparisons([criteria, ('Cost', dict(zip(c_pairs, (2, 5, 3, 2, 2, .5)))),
+                                             ('Capacity', {('Cargo', 'Passenger'): 0.2}),
+                                             ('Cargo', dict(zip(pairs, capacity_cargo_m))),
+                                             ('Passenger', dict(zip(pairs, capacity_pass_m))),
+                                             ('Safety', dict(zip(pairs, safety_m)), 3),
+                                             ('Style', dict(zip(pairs, style_m)), 3),
+                                             ('Price', dict(zip(pairs, cost_price_m)), 3),
+                                             ('Fuel', dict(zip(pairs, cost_fuel_m)), 3),
+                                             ('Resale', dict(zip(pairs, cost_resale_m)), 3)], executor=executor)
+            await composed.aadd_comparisons('Maintenance', dict(zip(pairs, cost_maint_m)), 3, 'saaty')
+            await composed.aadd_hierarchy(h, executor=executor)
+            with concurrent.futures.ProcessPoolExecutor(1) as processes, pytest.raises(TypeError):
+                await composed.aadd_hierarchy(h, executor=processes)
+        return composed
+
+    composed = asyncio.run(build())
+    assert composed.nodes[0].name == 'Criteria'
+    assert composed.report() == compose.report()
+
+
+def test_instrument():
+    events = []
+    with ahpy.instrument(lambda *event: events.append(event)) as records:
+        cu = ahpy.Compare('Incomplete Example', u)
+        cu.update_comparison(('a', 'b'), 2)
+    assert ahpy.ahpy._instrumentation is None
+    node = records.to_dict()['nodes']['Incomplete Example']
+    assert node['build_calls'] == node['update_calls'] == node['recompute_calls'] == 1
+    assert node['completion_calls'] == 2
+    assert node['completion_sweeps'] >= 2
+    assert node['eigen_solves'] >= node['objective_evaluations'] > 0
+    assert records.totals['eigen_solves'] == sum(value for event, _, value in events if event == 'eigen_solves')
+    assert json.loads(records.to_json())['totals'] == records.totals
+
+
+def test_result_cache(tmp_path):
+    ahpy.enable_cache(maxsize=1, path=str(tmp_path))
+    try:
+        first = ahpy.Compare('Incomplete Example', u)
+        second = ahpy.Compare('Second Example', u)
+        assert ahpy.cache_info()['hits'] == 1
+        assert second.report(verbose=True)['elements'] == first.report(verbose=True)['elements']
+        assert second._missing_comparisons == first._missing_comparisons
+        assert second._matrix is not first._matrix
+
+        ahpy.Compare('Drinks', drinks)
+        ahpy.Compare('Incomplete Example', u)
+        assert ahpy.cache_info() == {'hits': 2, 'misses': 2, 'evictions': 2, 'size': 1, 'maxsize': 1,
+                                     'path': str(tmp_path)}
+
+        ahpy.enable_cache()
+        with ahpy.instrument() as records:
+            assert ahpy.Compare('Drinks', drinks).local_weights == ahpy.Compare('Drinks', drinks).local_weights
+        assert records.nodes['Drinks']['priority_vector_calls'] == 1
+    finally:
+        ahpy.disable_cache()
+    assert ahpy.cache_info() is None
+
+
+def test_group_compare():
+    first = {('a', 'b'): 2, ('a', 'c'): 4, ('b', 'c'): 3, ('c', 'd'): 1}
+    second = {('b', 'a'): 2, ('a', 'c'): 1, ('b', 'c'): 3, ('c', 'd'): 4}
+    group = ahpy.GroupCompare('Group', (respondent for respondent in [first, second]))
+    assert group.respondent_count == 2
+    assert group.comparisons == pytest.approx({('a', 'b'): 1, ('a', 'c'): 2, ('b', 'c'): 3, ('c', 'd'): 2})
+    assert group.local_weights == ahpy.Compare('Group', group.comparisons).local_weights
+
+    individual = [ahpy.Compare(name, respondent, 15).local_weights
+                  for name, respondent in (('1', first), ('2', second))]
+    priorities = {element: np.sqrt(individual[0][element] * individual[1][element]) for element in individual[0]}
+    assert group.aggregated_priorities == pytest.approx(
+        {element: value / sum(priorities.values()) for element, value in priorities.items()}, abs=1e-4)
+
+    group.update([{('a', 'b'): 8, ('a', 'c'): 2, ('b', 'c'): 3, ('c', 'd'): 2}])
+    assert group.respondent_count == 3
+    assert group.comparisons[('a', 'b')] == pytest.approx(2)
+    assert group.comparisons[('c', 'd')] == pytest.approx(2)
+
+
+def test_group_compare_hierarchy():
+    parent = ahpy.Compare('Parent', {('Group', 'Other'): 3})
+    group = ahpy.GroupCompare('Group', [{'x': 1, 'y': 3}, {'x': 3, 'y': 1}], aip=False)
+    other = ahpy.Compare('Other', {'x': 1, 'y': 1})
+    parent.add_children([group, other])
+    assert parent.target_weights == {'x': 0.5, 'y': 0.5}
+    assert group.aggregated_priorities is None
+
+    group.update([{'x': 3, 'y': 1}])
+    assert parent.target_weights == {'x': 0.5679, 'y': 0.4321}
+    with pytest.raises(ValueError):
+        group.update([{'x': 1, 'y': 1}, {'x': 1, 'z': 1}])
+    assert group.respondent_count == 3
+
+
+def test_compose_save_load(tmp_path):
+    compose.save(tmp_path / 'compose')
+    with ahpy.instrument() as records:
+        loaded = ahpy.Compose.load(tmp_path / 'compose')
+    assert 'eigen_solves' not in records.totals and 'completion_calls' not in records.totals
+    assert [node.name for node in loaded.nodes] == [node.name for node in compose.nodes]
+    assert loaded.hierarchy == h
+    assert loaded.report(verbose=True) == compose.report(verbose=True)
+
+    loaded.Capacity.update_comparison(('Cargo', 'Passenger'), 0.5)
+    assert loaded.Criteria.target_weights != compose.Criteria.target_weights
+
+
+def test_compare_save_load(tmp_path):
+    parent = ahpy.Compare('Parent', {('Incomplete Example', 'Group'): 2})
+    group = ahpy.GroupCompare('Group', [{'a': 1, 'b': 3}, {'a': 3, 'b': 1}, {'a': 2, 'b': 2}])
+    parent.add_children([ahpy.Compare('Incomplete Example', u, completion='newton'), group])
+    parent.save(str(tmp_path / 'parent.npz'))
+    loaded = ahpy.Compare.load(str(tmp_path / 'parent.npz'))
+    assert loaded.report(complete=True, verbose=True) == parent.report(complete=True, verbose=True)
+    loaded_group = loaded._node_children[1]
+    assert isinstance(loaded_group, ahpy.GroupCompare)
+    assert loaded_group.aggregated_priorities == group.aggregated_priorities
+    loaded_group.update([{'a': 4, 'b': 1}])
+    group.update([{'a': 4, 'b': 1}])
+    assert loaded.target_weights == parent.target_weights
+
+
+def test_compare_from_values(tmp_path):
+    alternatives = ['x', 'y', 'z']
+    values = np.memmap(tmp_path / 'values.dat', float, 'w+', shape=(4, 3))
+    values[:] = [list(c_m.values()), list(e_m.values()), list(f_m.values()), list(g_m.values())]
+    va, vb, vd = (ahpy.Compare(name, comparisons, compact=True) for name, comparisons in
+                  (('a', a_m), ('b', b_m), ('d', d_m)))
+    vc, ve, vf, vg = (ahpy.Compare.from_values(name, values[row], alternatives) for row, name in enumerate('cefg'))
+    vd.add_children([vf, vg])
+    vb.add_children([vd, ve])
+    va.add_children([vb, vc])
+    assert va._node_vector is not None and vc._elements is vg._elements
+    assert va.report(complete=True, verbose=True) == a.report(complete=True, verbose=True)
+
+    vg.update_comparison('x', 2)
+    assert va.target_weights == {'z': 0.4138, 'y': 0.3781, 'x': 0.2081}
+    with pytest.raises(ValueError):
+        ahpy.Compare.from_values('Invalid', np.ones(2), alternatives)
+
+
+def test_synthesis_overlapping_children():
+    sa = ahpy.Compare('a', {('x', 'y'): 3, ('y', 'z'): 2, ('x', 'z'): 5})
+    sb = ahpy.Compare('b', {('w', 'y'): 0.5, ('y', 'x'): 1})
+    sc = ahpy.Compare('c', {'q': 1, 'x': 2, 'y': 2})
+    sp = ahpy.Compare('p', {('a', 'b'): 2, ('a', 'c'): 1, ('b', 'c'): 1})
+    sp.add_children([sa, sb, sc])
+    assert list(sp.target_weights.items()) == [('x', 0.5024), ('y', 0.3297), ('q', 0.0655), ('w', 0.052),
+                                               ('z', 0.0503)]
+
+    st = ahpy.Compare('t', {'x': 1, 'y': 1})
+    su = ahpy.Compare('u', {'y': 1, 'x': 1})
+    sr = ahpy.Compare('r', {('t', 'u'): 1})
+    sr.add_children([st, su])
+    assert list(sr.target_weights) == ['x', 'y']
+
+
+def test_batch_invalid_array():
+    with pytest.raises(ValueError):
+        ahpy.CompareBatch(np.ones((2, 3, 3)), elements=['a', 'b'])
+    matrices = np.ones((2, 3, 3))
+    matrices[1, 0, 2] = 2
+    with pytest.raises(ValueError):
+        ahpy.CompareBatch(matrices)
+
+
+def test_atomic_write_cleanup(tmp_path, monkeypatch):
+    ahpy.ahpy._atomic_write(str(tmp_path / 'a.json'), '{}')
+    assert (tmp_path / 'a.json').read_text() == '{}'
+
+    def fail(source, destination):
+        raise RuntimeError
+    monkeypatch.setattr(ahpy.ahpy.os, 'replace', fail)
+    with pytest.raises(RuntimeError):
+        ahpy.ahpy._atomic_write(str(tmp_path / 'b.pkl'), b'data')
+    assert [path.name for path in tmp_path.iterdir()] == ['a.json']
+
+
+def test_group_compare_stacked_priorities(monkeypatch):
+    monkeypatch.setattr(ahpy.ahpy, '_AIP_CHUNK_SIZE', 2)
+    respondents = [dict(zip(pairs, matrix)) for matrix in (safety_m, style_m, capacity_pass_m, cost_fuel_m)]
+    respondents.append({('Odyssey', 'Pilot'): 2, **dict(list(respondents[0].items())[1:])})
+    try:
+        ahpy.enable_cache()
+        with ahpy.instrument() as records:
+            group = ahpy.GroupCompare('Group', respondents)
+        assert ahpy.cache_info()['size'] == 1
+    finally:
+        ahpy.disable_cache()
+    assert records.nodes['Group']['build_calls'] == 1
+    individual = [ahpy.Compare('x', respondent, 15).local_weights for respondent in respondents]
+    priorities = {element: np.exp(np.mean([np.log(weights[element]) for weights in individual]))
+                  for element in individual[0]}
+    expected = {element: value / sum(priorities.values()) for element, value in priorities.items()}
+    assert group.aggregated_priorities == pytest.approx(expected, abs=1e-4)
+
+
+def test_warm_start_released():
+    previous = ahpy.Compare('Wave 0', u)
+    reference = weakref.ref(previous)
+    current = ahpy.Compare('Wave 1', u, warm_start=previous)
+    assert current.warm_start is None
+    del previous
+    assert reference() is None
+    assert current.local_weights == ahpy.Compare('Wave 1', u).local_weights
+
+
+def test_batch_consistent_matches_compare():
+    rng = np.random.default_rng(0)
+    weights = rng.integers(1, 10, (500, 6)).astype(float)
+    matrices = weights[:, :, np.newaxis] / weights[:, np.newaxis, :]
+    rows, columns = np.tril_indices(6, -1)
+    matrices[:, rows, columns] = 1 / matrices[:, columns, rows]
+    matrices[1, 0, 1], matrices[1, 1, 0] = 3, 1 / 3
+    elements = ['a', 'b', 'c', 'd', 'e', 'f']
+    batch = ahpy.CompareBatch(matrices, elements)
+    for number, matrix in enumerate(matrices):
+        comparisons = {(elements[row], elements[column]): matrix[row, column]
+                       for row, column in itertools.combinations(range(6), 2)}
+        cx = ahpy.Compare('x', comparisons)
+        assert dict(zip(batch.elements, batch.local_weights[number])) == cx.local_weights
+        assert batch.consistency_ratios[number] == cx.consistency_ratio
+
+
+def test_report_columns(tmp_path):
+    columns = compose.to_columns()
+    elements = columns.elements
+    assert len(columns) == sum(len(node._elements) for node in compose.nodes)
+    report = compose.report()
+    for node, element, local_weight, global_weight in zip(elements['node'], elements['element'],
+                                                          elements['local_weight'], elements['global_weight']):
+        weights = report[columns.names[node]]['elements']
+        assert weights['local_weights'][columns.names[element]] == local_weight
+        assert weights['global_weights'][columns.names[element]] == global_weight
+
+    incomplete = ahpy.Compare('Incomplete', u, cr=False)
+    columns.extend([incomplete, compose])
+    assert columns.count == 3
+    assert len(columns) == 2 * len(elements['node']) + 4
+    assert np.isnan(columns.elements['consistency_ratio'][columns.elements['hierarchy'] == 1]).all()
+    comparisons = columns.comparisons
+    assert [columns.names[code] for code in (comparisons['node'][0], comparisons['first'][0],
+                                             comparisons['second'][0])] == ['Incomplete', 'c', 'd']
+    assert comparisons['value'][0] == incomplete.report(verbose=True)['comparisons']['computed'][('c', 'd')]
+
+    with pytest.raises(ValueError):
+        columns.write(tmp_path / 'columns.csv', format='csv')
+    pyarrow = pytest.importorskip('pyarrow')
+    table = columns.to_arrow()
+    assert table.num_rows == len(columns)
+    assert pyarrow.types.is_dictionary(table.schema.field('element').type)
+    columns.write(tmp_path / 'columns.parquet')
+    columns.write(tmp_path / 'comparisons.feather', 'comparisons', 'feather')
+
+
+def test_save_binary_format(tmp_path):
+    compose.save(tmp_path / 'compose')
+    with np.load(tmp_path / 'compose.npz') as file:
+        metadata = json.loads(file['metadata'].tobytes().decode())
+        assert file['metadata'].dtype == np.uint8 and 'comparisons' not in metadata['nodes'][0]
+        assert len(metadata['elements']) == len(set(metadata['elements']))
+        keys, values = file['0/comparison_keys'], file['0/comparison_values']
+    node = compose.nodes[0]
+    assert keys.dtype == np.int64 and values.dtype == float
+    assert [(metadata['elements'][first], metadata['elements'][second]) for first, second in keys] == \
+        list(node.comparisons)
+    assert values.tolist() == list(node.comparisons.values())
+
+
+def test_from_values_save_load_update(tmp_path):
+    alternatives = ['x', 'y', 'z']
+    values = np.memmap(tmp_path / 'values.dat', float, 'w+', shape=(2, 3))
+    values[:] = [list(c_m.values()), list(e_m.values())]
+    values.flush()
+    values = np.memmap(tmp_path / 'values.dat', float, 'r', shape=(2, 3))
+    vc, ve = (ahpy.Compare.from_values(name, values[row], alternatives) for row, name in enumerate('ce'))
+    parent = ahpy.Compare('p', {('c', 'e'): 2}, compact=True)
+    parent.add_children([vc, ve])
+    parent.save(tmp_path / 'parent')
+    with np.load(tmp_path / 'parent.npz') as file:
+        assert [name for name in file.files if name.startswith('alternatives/')] == ['alternatives/0']
+        assert {'1/comparison_keys', '1/matrix', '2/matrix'}.isdisjoint(file.files) and '1/values' in file.files
+    loaded = ahpy.Compare.load(tmp_path / 'parent')
+    lc, le = loaded._node_children
+    assert isinstance(lc.comparisons, ahpy.ahpy._ValueMapping) and lc._elements is le._elements
+    assert lc._matrix is lc.comparisons.values
+    assert loaded.report(complete=True, verbose=True) == parent.report(complete=True, verbose=True)
+
+    lc.update_comparison('x', 2)
+    vc.update_comparison('x', 2)
+    assert isinstance(lc.comparisons, ahpy.ahpy._ValueMapping) and lc.comparisons['x'] == 2
+    assert isinstance(vc.comparisons, ahpy.ahpy._ValueMapping) and values[0, 0] == c_m['x']
+    assert loaded.target_weights == parent.target_weights
+
+
+def test_group_compare_method_checked():
+    answers = ({('a', 'b'): 2, ('b', 'c'): 3, ('a', 'c'): 5, ('a', 'd'): 1, ('b', 'd'): 4, ('c', 'd'): 1 / 3},
+               {('a', 'b'): 3, ('b', 'c'): 1, ('a', 'c'): 2, ('a', 'd'): 6, ('b', 'd'): 1 / 2, ('c', 'd'): 2})
+    consumed = []
+
+    def respondents():
+        for comparisons in answers:
+            consumed.append(comparisons)
+            yield comparisons
+
+    with pytest.raises(ValueError):
+        ahpy.GroupCompare('Group', respondents(), method='invalid')
+    with pytest.raises(ValueError):
+        ahpy.GroupCompare('Group', respondents(), completion='invalid')
+    assert not consumed
+
+    group = ahpy.GroupCompare('Group', respondents(), method='Geometric', completion='LLSM')
+    assert (group.method, group.completion) == ('geometric', 'llsm')
+    assert group.aggregated_priorities == {'a': 0.4659, 'b': 0.2232, 'd': 0.1721, 'c': 0.1387}
+
+
+def test_group_compare_update_comparisons():
+    group = ahpy.GroupCompare('Group', [{('a', 'b'): 2, ('b', 'c'): 3}, {('a', 'b'): 4, ('a', 'c'): 5}], aip=False)
+    weights = group.local_weights
+    with pytest.raises(TypeError):
+        group.update_comparison(('a', 'b'), 9)
+    with pytest.raises(TypeError):
+        group.update_comparisons({('a', 'b'): 9})
+    assert group.local_weights == weights
+    group.update([{('a', 'b'): 1}])
+    assert group.comparisons[('a', 'b')] == pytest.approx(2)
+
+
+def test_compose_without_hierarchy():
+    pending = ahpy.Compose()
+    pending.add_comparisons('Criteria', {('a', 'b'): 2})
+    for report in (pending.report, pending.iter_report, pending.to_columns,
+                   lambda: pending.write_report(io.StringIO()),
+                   lambda: ahpy.sensitivity.Sensitivity(pending, samples=10)):
+        with pytest.raises(ValueError, match='add_hierarchy'):
+            report()
+    assert pending.report('Criteria')['name'] == 'Criteria'
+
+
+def test_result_cache_key():
+    uncached = ahpy.Compare('Incomplete Example', u, warm_start={('c', 'd'): 5})._missing_comparisons
+    ahpy.enable_cache()
+    try:
+        ahpy.Compare('Incomplete Example', u)
+        warm = ahpy.Compare('Incomplete Example', u, warm_start={('c', 'd'): 5})
+        llsm = ahpy.Compare('Incomplete Example', u, warm_start='LLSM')
+        assert ahpy.cache_info()['hits'] == 0
+        assert warm._missing_comparisons == uncached
+        assert ahpy.Compare('Incomplete Example', u, warm_start='llsm').local_weights == llsm.local_weights
+        assert ahpy.cache_info()['hits'] == 1
+
+        alternatives = ['x', 'y', 'z']
+        first = ahpy.Compare.from_values('Values', np.array([1.0, 2.0, 3.0]), alternatives)
+        ahpy.Compare.from_values('Values', np.array([1.0, 2.0, 3.0]), alternatives)
+        assert ahpy.cache_info()['hits'] == 2
+        ahpy.Compare.from_values('Values', np.array([1.0, 2.0, 4.0]), alternatives)
+        ahpy.Compare.from_values('Values', np.array([1.0, 2.0, 3.0]), ['x', 'y', 'w'])
+        assert ahpy.cache_info()['hits'] == 2
+        assert first.local_weights == ahpy.Compare('Values', {'x': 1, 'y': 2, 'z': 3}).local_weights
+    finally:
+        ahpy.disable_cache()